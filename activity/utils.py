@@ -62,16 +62,13 @@ def parse_user_agent(user_agent_string):
     return browser, os, device_type
 
 
-def create_login_activity(user, request):
-    ip_address = get_client_ip(request)
-    user_agent = request.META.get('HTTP_USER_AGENT', '')
+def create_login_activity(user_id, ip_address, user_agent):
     browser, operating_system, device_type = parse_user_agent(user_agent)
     
     LoginActivity.objects.create(
-        user=user,
+        user_id=user_id,
         ip_address=ip_address,
         browser=browser,
         operating_system=operating_system,
         device_type=device_type
     )
-
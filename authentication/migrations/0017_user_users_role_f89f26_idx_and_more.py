@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-16 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('authentication', '0016_user_start_continuous_orders_after'),
+        ('level', '0005_alter_level_price_max_percent_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['role', 'is_active', '-date_joined'], name='users_role_f89f26_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['created_by', '-date_joined'], name='users_created_01cb69_idx'),
+        ),
+    ]
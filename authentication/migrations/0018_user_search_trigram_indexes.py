@@ -0,0 +1,39 @@
+# Generated manually for trigram indexes on the user search columns (PostgreSQL only)
+
+from django.db import migrations
+
+TRIGRAM_INDEXES = [
+    ('users_email_trgm', 'email'),
+    ('users_username_trgm', 'username'),
+    ('users_phone_number_trgm', 'phone_number'),
+    ('users_invitation_code_trgm', 'invitation_code'),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # icontains compiles to UPPER(col::text) LIKE UPPER(%s) on PostgreSQL, so index that expression
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON users USING gin (UPPER({column}::text) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _ in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0017_user_users_role_f89f26_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
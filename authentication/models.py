@@ -151,6 +151,10 @@ class User(AbstractBaseUser, PermissionsMixin):
         db_table = 'users'
         verbose_name = 'User'
         verbose_name_plural = 'Users'
+        indexes = [
+            models.Index(fields=['role', 'is_active', '-date_joined']),
+            models.Index(fields=['created_by', '-date_joined']),
+        ]
     
     def __str__(self):
         return self.email
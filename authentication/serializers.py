@@ -1,12 +1,30 @@
 from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
 from django.contrib.auth import get_user_model
+import copy
 import secrets
 import string
 from .models import User
 from level.models import Level
 
 
+class CachedFieldsMixin:
+    """
+    Build a serializer's field set once per class and give each instance shallow copies,
+    instead of re-running get_fields() and deep-copying every declared field per instantiation.
+    Only use on serializers whose fields do not depend on the instance or context.
+    """
+    _fields_cache = {}
+
+    def get_fields(self):
+        cls = type(self)
+        fields = CachedFieldsMixin._fields_cache.get(cls)
+        if fields is None:
+            fields = super().get_fields()
+            CachedFieldsMixin._fields_cache[cls] = fields
+        return {name: copy.copy(field) for name, field in fields.items()}
+
+
 class UserRegistrationSerializer(serializers.ModelSerializer):
     login_password = serializers.CharField(write_only=True, required=True)
     confirm_login_password = serializers.CharField(write_only=True, required=True)
@@ -99,15 +117,18 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         login_password = validated_data.pop('login_password')
         withdraw_password = validated_data.pop('withdraw_password', None)
         agent_invitation_code = validated_data.pop('invitation_code', None)
+        created_by = validated_data.pop('created_by', None)
         
         agent = None
-        if agent_invitation_code:
+        if agent_invitation_code and not created_by:
             agent = User.objects.get(invitation_code=agent_invitation_code, role='AGENT')
         
         new_invitation_code = self.generate_unique_invitation_code()
         
         extra_fields = {}
-        if agent:
+        if created_by:
+            extra_fields['created_by'] = created_by
+        elif agent:
             extra_fields['created_by'] = agent
         
         from level.models import Level
@@ -162,7 +183,7 @@ class UserLoginSerializer(serializers.Serializer):
         raise serializers.ValidationError('Email and password are required.')
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     role = serializers.CharField(read_only=True)
     created_by_email = serializers.EmailField(source='created_by.email', read_only=True)
     created_by_username = serializers.CharField(source='created_by.username', read_only=True)
@@ -208,7 +229,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
         return None
 
 
-class UserUpdateSerializer(serializers.ModelSerializer):
+class UserUpdateSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['username', 'phone_number', 'email']
@@ -232,7 +253,7 @@ class UserUpdateSerializer(serializers.ModelSerializer):
         return value
 
 
-class AgentCreateSerializer(serializers.ModelSerializer):
+class AgentCreateSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     login_password = serializers.CharField(write_only=True, required=True)
     confirm_login_password = serializers.CharField(write_only=True, required=True)
     
@@ -315,7 +336,7 @@ class AgentCreateSerializer(serializers.ModelSerializer):
         )
         if created_by:
             user.created_by = created_by
-            user.save()
+            user.save(update_fields=['created_by'])
         return user
 
 
@@ -0,0 +1,17 @@
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+
+
+class RefreshToken(BaseRefreshToken):
+    """
+    RefreshToken that remembers its last encoded form while the payload is unchanged.
+    With the blacklist app installed, for_user() already signs the token to store it as an
+    OutstandingToken, so the str(refresh) in get_tokens_for_user reuses that signature.
+    """
+    _encoded = None
+
+    def __str__(self):
+        if self._encoded is not None and self._encoded[0] == self.payload:
+            return self._encoded[1]
+        encoded = super().__str__()
+        self._encoded = (dict(self.payload), encoded)
+        return encoded
@@ -1,38 +1,38 @@
 from rest_framework import status, generics, permissions
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
 from rest_framework_simplejwt.views import TokenRefreshView
+from django.core.cache import cache
 from django.utils import timezone
 from django.db.models import Q, Count, Sum
-from datetime import timedelta, datetime
+from datetime import timedelta
+import jwt
 from .models import User
+from .tokens import RefreshToken
 
 
-def get_time_ago(dt):
-    """Calculate time ago string from datetime"""
+_TIME_AGO_UNITS = (
+    (86400, "1 day ago", "{} days ago"),
+    (3600, "1 hour ago", "{} hours ago"),
+    (60, "1 min ago", "{} mins ago"),
+)
+
+
+def get_time_ago(dt, now=None):
+    """Calculate time ago string from datetime; pass now to reuse one timestamp across a loop"""
     if not dt:
         return None
     
-    now = timezone.now()
-    diff = now - dt
-    
-    if diff.days > 0:
-        if diff.days == 1:
-            return "1 day ago"
-        return f"{diff.days} days ago"
-    elif diff.seconds >= 3600:
-        hours = diff.seconds // 3600
-        if hours == 1:
-            return "1 hour ago"
-        return f"{hours} hours ago"
-    elif diff.seconds >= 60:
-        minutes = diff.seconds // 60
-        if minutes == 1:
-            return "1 min ago"
-        return f"{minutes} mins ago"
-    else:
-        return "Just now"
+    seconds = int(((now or timezone.now()) - dt).total_seconds())
+    for unit_seconds, one, many in _TIME_AGO_UNITS:
+        if seconds >= unit_seconds:
+            count = seconds // unit_seconds
+            return one if count == 1 else many.format(count)
+    return "Just now"
 
 
 def get_user_initials(username):
@@ -47,6 +47,19 @@ def get_user_initials(username):
     return ""
 
 
+def unwrap_single_errors(serializer_errors):
+    """Unwrap single-message error lists so each field maps to one message where possible"""
+    errors = {}
+    for field, error_list in serializer_errors.items():
+        if isinstance(error_list, list):
+            errors[field] = error_list[0] if len(error_list) == 1 else error_list
+        elif isinstance(error_list, dict):
+            errors[field] = error_list
+        else:
+            errors[field] = str(error_list)
+    return errors
+
+
 def format_user_table_data(users_queryset):
     """Helper function to format users in table-friendly format"""
     table_data = []
@@ -94,6 +107,108 @@ def format_user_table_data(users_queryset):
     return table_data
 
 
+USER_SEARCH_FIELDS = ('email', 'username', 'phone_number')
+
+
+def _apply_user_filters(queryset, query_params, search_fields=USER_SEARCH_FIELDS,
+                        filters=('is_active', 'role', 'is_training_account')):
+    """Apply the shared search / role / is_active / is_training_account query params to a User queryset"""
+    search = query_params.get('search', None)
+    if search:
+        search_q = Q()
+        for field in search_fields:
+            search_q |= Q(**{f'{field}__icontains': search})
+        queryset = queryset.filter(search_q)
+    
+    if 'role' in filters:
+        role = query_params.get('role', None)
+        if role:
+            queryset = queryset.filter(role=role.upper())
+    
+    if 'is_active' in filters:
+        is_active = query_params.get('is_active', None)
+        if is_active is not None:
+            queryset = queryset.filter(is_active=is_active.lower() == 'true')
+    
+    if 'is_training_account' in filters:
+        is_training_account = query_params.get('is_training_account', None)
+        if is_training_account is not None:
+            queryset = queryset.filter(is_training_account=is_training_account.lower() == 'true')
+    
+    return queryset
+
+
+def _nest_training_accounts(users_data):
+    """
+    Attach training accounts to their original account.
+    users_data must already be in display order (newest first); a single walk keeps that
+    order, and training accounts whose original is not in the list stay top-level.
+    """
+    original_ids = {
+        user_data['id'] for user_data in users_data
+        if not user_data['is_training_account']
+    }
+    structured_data = []
+    training_by_original = {}
+    for user_data in users_data:
+        original_account_id = user_data.get('original_account_id')
+        if user_data['is_training_account'] and original_account_id in original_ids:
+            training_by_original.setdefault(original_account_id, []).append(user_data)
+        else:
+            structured_data.append({
+                **user_data,
+                'training_accounts': training_by_original.setdefault(user_data['id'], [])
+            })
+    return structured_data
+
+
+class UserListPagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
+def _wants_page(request):
+    # Paging is opt-in so existing callers keep getting the full list
+    return 'page' in request.query_params or 'page_size' in request.query_params
+
+
+def _paginate(request, queryset):
+    """
+    Slice queryset to the requested page; returns (page_rows, meta) with count/next/previous for the response.
+    Without ?page or ?page_size every row is returned and meta only carries the count.
+    """
+    if not _wants_page(request):
+        rows = list(queryset)
+        return rows, {'count': len(rows)}
+    paginator = UserListPagination()
+    page = paginator.paginate_queryset(queryset, request)
+    return page, {
+        'count': paginator.page.paginator.count,
+        'next': paginator.get_next_link(),
+        'previous': paginator.get_previous_link(),
+    }
+
+
+def _structured_users_page(request, queryset):
+    """
+    Paginate the top-level rows (original accounts, plus training accounts whose original
+    is not in queryset), then nest the page's training accounts under their originals.
+    meta['count'] is every matched user, training accounts included, not just the top-level rows.
+    """
+    if not _wants_page(request):
+        users_data = UserProfileSerializer(queryset, many=True).data
+        return _nest_training_accounts(users_data), {'count': len(users_data)}
+    originals = queryset.filter(is_training_account=False).values('id')
+    top_level = queryset.exclude(is_training_account=True, original_account__in=originals)
+    page, meta = _paginate(request, top_level)
+    meta['count'] = queryset.count()
+    page_original_ids = [user.id for user in page if not user.is_training_account]
+    trainings = queryset.filter(is_training_account=True, original_account__in=page_original_ids)
+    users_data = UserProfileSerializer([*page, *trainings], many=True).data
+    return _nest_training_accounts(users_data), meta
+
+
 from .serializers import (
     UserRegistrationSerializer,
     UserLoginSerializer,
@@ -106,7 +221,40 @@ from .serializers import (
     AgentProfileUpdateSerializer
 )
 from .permissions import IsAdmin, IsAdminOrAgent, IsAgent
-from activity.utils import create_login_activity
+from activity.utils import create_login_activity, get_client_ip
+from backend.renderers import json_response
+
+
+def _update_user_and_fetch(user_id, owner=None, **fields):
+    """
+    Write fields with a single UPDATE (no full-row save) and re-read the user for the response.
+    With owner set, only users created by owner match. Returns None when nothing matched.
+    """
+    users = User.objects.filter(id=user_id)
+    if owner is not None:
+        users = users.filter(created_by=owner)
+    if not users.update(**fields):
+        return None
+    invalidate_admin_stats_cache()
+    return User.objects.select_related('level', 'created_by', 'original_account').get(id=user_id)
+
+
+ADMIN_STATS_CACHE_TIMEOUT = 30
+ADMIN_STATS_GENERATION_KEY = 'admin_stats:generation'
+
+
+def _admin_stats_cache_key(user):
+    # Bumping the generation (see invalidate_admin_stats_cache) orphans every cached stats entry at once
+    generation = cache.get_or_set(ADMIN_STATS_GENERATION_KEY, 0, None)
+    return f'admin_stats:{generation}:{user.id}:{int(user.is_admin)}'
+
+
+def invalidate_admin_stats_cache():
+    """Drop cached dashboard stats after users are created, deleted, (de)activated or change role"""
+    try:
+        cache.incr(ADMIN_STATS_GENERATION_KEY)
+    except ValueError:
+        cache.set(ADMIN_STATS_GENERATION_KEY, 1, None)
 
 
 def get_tokens_for_user(user):
@@ -125,17 +273,7 @@ class UserRegistrationView(generics.CreateAPIView):
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         if not serializer.is_valid():
-            errors = {}
-            for field, error_list in serializer.errors.items():
-                if isinstance(error_list, list):
-                    if len(error_list) == 1:
-                        errors[field] = error_list[0]
-                    else:
-                        errors[field] = error_list
-                elif isinstance(error_list, dict):
-                    errors[field] = error_list
-                else:
-                    errors[field] = str(error_list)
+            errors = unwrap_single_errors(serializer.errors)
             
             return Response({
                 'success': False,
@@ -143,6 +281,7 @@ class UserRegistrationView(generics.CreateAPIView):
                 'errors': errors
             }, status=status.HTTP_400_BAD_REQUEST)
         user = serializer.save()
+        invalidate_admin_stats_cache()
         tokens = get_tokens_for_user(user)
         return Response({
             'success': True,
@@ -159,8 +298,12 @@ def login_view(request):
     if serializer.is_valid():
         user = serializer.validated_data['user']
         user.last_login = timezone.now()
-        user.save(update_fields=['last_login'])
-        create_login_activity(user, request)
+        User.objects.filter(pk=user.pk).update(last_login=user.last_login)
+        create_login_activity(
+            user.id,
+            get_client_ip(request),
+            request.META.get('HTTP_USER_AGENT', '')
+        )
         tokens = get_tokens_for_user(user)
         return Response({
             **tokens,
@@ -207,14 +350,41 @@ def login_view(request):
     }, status=status.HTTP_400_BAD_REQUEST)
 
 
+def blacklist_refresh_token(refresh_token, user):
+    """
+    Blacklist a refresh token belonging to the given user.
+    The jti is read without verifying the signature; scoping the lookup to the
+    authenticated user's outstanding tokens keeps this safe. Anything that does
+    not match falls back to the fully verified RefreshToken path.
+    """
+    try:
+        payload = jwt.decode(refresh_token, options={'verify_signature': False})
+    except jwt.InvalidTokenError:
+        payload = {}
+    jti = payload.get(jwt_settings.JTI_CLAIM)
+    
+    outstanding_id = None
+    if jti:
+        outstanding_id = OutstandingToken.objects.filter(
+            jti=jti, user=user
+        ).values_list('id', flat=True).first()
+    
+    if outstanding_id is None:
+        try:
+            RefreshToken(refresh_token).blacklist()
+        except TokenError:
+            pass
+        return
+    BlacklistedToken.objects.get_or_create(token_id=outstanding_id)
+
+
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def logout_view(request):
     try:
         refresh_token = request.data.get('refresh_token')
         if refresh_token:
-            token = RefreshToken(refresh_token)
-            token.blacklist()
+            blacklist_refresh_token(refresh_token, request.user)
     except Exception:
         pass
     return Response({'message': 'Logout successful'}, status=status.HTTP_200_OK)
@@ -240,10 +410,10 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def check_auth_view(request):
-    return Response({
+    return json_response({
         'authenticated': True,
         'user': UserProfileSerializer(request.user).data
-    }, status=status.HTTP_200_OK)
+    })
 
 
 @api_view(['GET'])
@@ -271,7 +441,7 @@ def get_invitation_code(request):
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def check_user_role_view(request):
-    return Response({
+    return json_response({
         'is_admin': request.user.is_admin,
         'is_agent': request.user.is_agent,
         'is_user': request.user.is_normal_user,
@@ -279,7 +449,7 @@ def check_user_role_view(request):
         'user_id': request.user.id,
         'username': request.user.username,
         'email': request.user.email
-    }, status=status.HTTP_200_OK)
+    })
 
 
 @api_view(['GET'])
@@ -297,20 +467,7 @@ class AdminUserListView(generics.ListAPIView):
     
     def get_queryset(self):
         queryset = User.objects.all().order_by('-date_joined')
-        search = self.request.query_params.get('search', None)
-        if search:
-            queryset = queryset.filter(
-                Q(email__icontains=search) |
-                Q(username__icontains=search) |
-                Q(phone_number__icontains=search)
-            )
-        role = self.request.query_params.get('role', None)
-        if role:
-            queryset = queryset.filter(role=role.upper())
-        is_active = self.request.query_params.get('is_active', None)
-        if is_active is not None:
-            queryset = queryset.filter(is_active=is_active.lower() == 'true')
-        return queryset
+        return _apply_user_filters(queryset, self.request.query_params, filters=('role', 'is_active'))
 
 
 class AdminUserDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -327,26 +484,41 @@ class AdminUserDetailView(generics.RetrieveUpdateDestroyAPIView):
     def destroy(self, request, *args, **kwargs):
         user = self.get_object()
         user.is_active = False
-        user.save()
+        user.save(update_fields=['is_active'])
+        invalidate_admin_stats_cache()
         return Response({'message': 'User deactivated successfully'}, status=status.HTTP_200_OK)
 
 
 @api_view(['GET'])
 @permission_classes([IsAdminOrAgent])
 def admin_dashboard_stats(request):
-    if request.user.is_admin:
+    stats = cache.get_or_set(
+        _admin_stats_cache_key(request.user),
+        lambda: _compute_dashboard_stats(request.user),
+        ADMIN_STATS_CACHE_TIMEOUT
+    )
+    return Response(stats, status=status.HTTP_200_OK)
+
+
+def _compute_dashboard_stats(viewer):
+    if viewer.is_admin:
         user_queryset = User.objects.all()
-        agent_queryset = User.objects.filter(role='AGENT')
     else:
-        user_queryset = User.objects.filter(created_by=request.user)
-        agent_queryset = User.objects.filter(role='AGENT', created_by=request.user)
-    
-    active_session = user_queryset.exclude(last_login__isnull=True).count()
+        user_queryset = User.objects.filter(created_by=viewer)
+    
+    # Agents are always a subset of user_queryset, so every counter folds into one query
+    stats = user_queryset.aggregate(
+        total_users=Count('id'),
+        active_session=Count('id', filter=Q(last_login__isnull=False)),
+        total_agent=Count('id', filter=Q(role='AGENT')),
+        suspended_users=Count('id', filter=Q(is_active=False)),
+    )
     
     recent_users = user_queryset.exclude(
         last_login__isnull=True
-    ).order_by('-last_login')[:5]
+    ).order_by('-last_login').only('id', 'username', 'email', 'last_login', 'is_active')[:5]
     
+    now = timezone.now()
     top_users = []
     for user in recent_users:
         top_users.append({
@@ -354,95 +526,85 @@ def admin_dashboard_stats(request):
             'initials': get_user_initials(user.username),
             'name': user.username,
             'email': user.email,
-            'time_ago': get_time_ago(user.last_login),
+            'time_ago': get_time_ago(user.last_login, now),
             'status': 'Active' if user.is_active else 'Inactive'
         })
     
-    return Response({
-        'total_users': user_queryset.count(),
-        'active_session': active_session,
-        'total_agent': agent_queryset.count(),
-        'suspended_users': user_queryset.filter(is_active=False).count(),
+    return {
+        'total_users': stats['total_users'],
+        'active_session': stats['active_session'],
+        'total_agent': stats['total_agent'],
+        'suspended_users': stats['suspended_users'],
         'top_recent_users': top_users
-    }, status=status.HTTP_200_OK)
+    }
 
 
 @api_view(['POST'])
 @permission_classes([IsAdmin])
 def admin_activate_user(request, user_id):
-    try:
-        user = User.objects.get(id=user_id)
-        user.is_active = True
-        user.save()
-        return Response({
-            'message': 'User activated successfully',
-            'user': UserProfileSerializer(user).data
-        }, status=status.HTTP_200_OK)
-    except User.DoesNotExist:
+    user = _update_user_and_fetch(user_id, is_active=True)
+    if user is None:
         return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
+    return Response({
+        'message': 'User activated successfully',
+        'user': UserProfileSerializer(user).data
+    }, status=status.HTTP_200_OK)
 
 
 @api_view(['POST'])
 @permission_classes([IsAdmin])
 def admin_deactivate_user(request, user_id):
-    try:
-        user = User.objects.get(id=user_id)
-        user.is_active = False
-        user.save()
-        return Response({
-            'message': 'User deactivated successfully',
-            'user': UserProfileSerializer(user).data
-        }, status=status.HTTP_200_OK)
-    except User.DoesNotExist:
+    user = _update_user_and_fetch(user_id, is_active=False)
+    if user is None:
         return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
+    return Response({
+        'message': 'User deactivated successfully',
+        'user': UserProfileSerializer(user).data
+    }, status=status.HTTP_200_OK)
 
 
 @api_view(['POST'])
 @permission_classes([IsAdmin])
 def admin_change_user_role(request, user_id):
-    try:
-        user = User.objects.get(id=user_id)
-        new_role = request.data.get('role', '').upper()
-        if new_role not in ['ADMIN', 'AGENT', 'USER']:
-            return Response({'error': 'Invalid role. Must be ADMIN, AGENT, or USER'}, status=status.HTTP_400_BAD_REQUEST)
-        user.role = new_role
-        if new_role == 'ADMIN':
-            user.is_staff = True
-        user.save()
-        return Response({
-            'message': f'User role changed to {new_role}',
-            'user': UserProfileSerializer(user).data
-        }, status=status.HTTP_200_OK)
-    except User.DoesNotExist:
+    new_role = request.data.get('role', '').upper()
+    if new_role not in ['ADMIN', 'AGENT', 'USER']:
+        return Response({'error': 'Invalid role. Must be ADMIN, AGENT, or USER'}, status=status.HTTP_400_BAD_REQUEST)
+    fields = {'role': new_role}
+    if new_role == 'ADMIN':
+        fields['is_staff'] = True
+    user = _update_user_and_fetch(user_id, **fields)
+    if user is None:
         return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
+    return Response({
+        'message': f'User role changed to {new_role}',
+        'user': UserProfileSerializer(user).data
+    }, status=status.HTTP_200_OK)
 
 
 @api_view(['GET'])
 @permission_classes([IsAdminOrAgent])
 def agent_dashboard_stats(request):
-    return Response({
-        'total_users': User.objects.filter(role='USER').count(),
-        'active_users': User.objects.filter(role='USER', is_active=True).count(),
-        'recent_registrations': User.objects.filter(
-            role='USER',
-            date_joined__gte=timezone.now() - timedelta(days=7)
-        ).count()
-    }, status=status.HTTP_200_OK)
+    stats = User.objects.filter(role='USER').aggregate(
+        total_users=Count('id'),
+        active_users=Count('id', filter=Q(is_active=True)),
+        recent_registrations=Count('id', filter=Q(date_joined__gte=timezone.now() - timedelta(days=7))),
+    )
+    return Response(stats, status=status.HTTP_200_OK)
 
 
 @api_view(['GET'])
 @permission_classes([IsAdminOrAgent])
 def agent_user_list(request):
     queryset = User.objects.filter(role='AGENT').order_by('-date_joined')
-    search = request.query_params.get('search', None)
-    if search:
-        queryset = queryset.filter(
-            Q(email__icontains=search) |
-            Q(username__icontains=search) |
-            Q(phone_number__icontains=search)
-        )
-    serializer = UserProfileSerializer(queryset, many=True)
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    queryset = _apply_user_filters(queryset, request.query_params, filters=())
+    page, meta = _paginate(request, queryset)
+    serializer = UserProfileSerializer(page, many=True)
+    if not _wants_page(request):
+        return Response(serializer.data, status=status.HTTP_200_OK)
+    return Response({
+        'users': serializer.data,
+        **meta
+    }, status=status.HTTP_200_OK)
 
 
 @api_view(['GET'])
@@ -454,63 +616,15 @@ def agent_my_created_users(request):
     Returns structured data showing relationship between original and training accounts.
     Accessible by both admins and agents.
     """
-    queryset = User.objects.filter(created_by=request.user).select_related('level', 'original_account', 'created_by').prefetch_related('training_accounts').order_by('-date_joined')
-    
-    search = request.query_params.get('search', None)
-    if search:
-        queryset = queryset.filter(
-            Q(email__icontains=search) |
-            Q(username__icontains=search) |
-            Q(phone_number__icontains=search)
-        )
-    
-    is_active = request.query_params.get('is_active', None)
-    if is_active is not None:
-        queryset = queryset.filter(is_active=is_active.lower() == 'true')
+    queryset = User.objects.filter(created_by=request.user).select_related('level', 'original_account', 'created_by').order_by('-date_joined')
     
-    role = request.query_params.get('role', None)
-    if role:
-        queryset = queryset.filter(role=role.upper())
+    queryset = _apply_user_filters(queryset, request.query_params)
     
-    is_training_account = request.query_params.get('is_training_account', None)
-    if is_training_account is not None:
-        queryset = queryset.filter(is_training_account=is_training_account.lower() == 'true')
-    
-    all_users = queryset
-    original_accounts = all_users.filter(is_training_account=False)
-    training_accounts = all_users.filter(is_training_account=True)
-    
-    original_accounts_serializer = UserProfileSerializer(original_accounts, many=True)
-    training_accounts_serializer = UserProfileSerializer(training_accounts, many=True)
-    
-    structured_data = []
-    original_accounts_dict = {}
-    
-    for original_account_data in original_accounts_serializer.data:
-        original_account_id = original_account_data['id']
-        original_accounts_dict[original_account_id] = {
-            **original_account_data,
-            'training_accounts': []
-        }
-    
-    for training_account_data in training_accounts_serializer.data:
-        original_account_id = training_account_data.get('original_account_id')
-        if original_account_id and original_account_id in original_accounts_dict:
-            original_accounts_dict[original_account_id]['training_accounts'].append(training_account_data)
-        else:
-            structured_data.append({
-                **training_account_data,
-                'training_accounts': []
-            })
-    
-    for account_data in original_accounts_dict.values():
-        structured_data.append(account_data)
-    
-    structured_data.sort(key=lambda x: x['date_joined'], reverse=True)
+    structured_data, meta = _structured_users_page(request, queryset)
     
     return Response({
         'users': structured_data,
-        'count': all_users.count()
+        **meta
     }, status=status.HTTP_200_OK)
 
 
@@ -522,26 +636,13 @@ def agent_created_users_list(request):
     else:
         queryset = User.objects.filter(created_by=request.user).order_by('-date_joined')
     
-    search = request.query_params.get('search', None)
-    if search:
-        queryset = queryset.filter(
-            Q(email__icontains=search) |
-            Q(username__icontains=search) |
-            Q(phone_number__icontains=search)
-        )
-    
-    is_active = request.query_params.get('is_active', None)
-    if is_active is not None:
-        queryset = queryset.filter(is_active=is_active.lower() == 'true')
+    queryset = _apply_user_filters(queryset, request.query_params, filters=('is_active', 'role'))
     
-    role = request.query_params.get('role', None)
-    if role:
-        queryset = queryset.filter(role=role.upper())
-    
-    serializer = UserProfileSerializer(queryset, many=True)
+    page, meta = _paginate(request, queryset)
+    serializer = UserProfileSerializer(page, many=True)
     return Response({
         'users': serializer.data,
-        'count': queryset.count()
+        **meta
     }, status=status.HTTP_200_OK)
 
 
@@ -550,17 +651,7 @@ def agent_created_users_list(request):
 def agent_create_user(request):
     serializer = UserRegistrationSerializer(data=request.data)
     if not serializer.is_valid():
-        errors = {}
-        for field, error_list in serializer.errors.items():
-            if isinstance(error_list, list):
-                if len(error_list) == 1:
-                    errors[field] = error_list[0]
-                else:
-                    errors[field] = error_list
-            elif isinstance(error_list, dict):
-                errors[field] = error_list
-            else:
-                errors[field] = str(error_list)
+        errors = unwrap_single_errors(serializer.errors)
         
         return Response({
             'success': False,
@@ -568,9 +659,8 @@ def agent_create_user(request):
             'errors': errors
         }, status=status.HTTP_400_BAD_REQUEST)
     
-    user = serializer.save()
-    user.created_by = request.user
-    user.save()
+    user = serializer.save(created_by=request.user)
+    invalidate_admin_stats_cache()
     
     return Response({
         'success': True,
@@ -582,45 +672,35 @@ def agent_create_user(request):
 @api_view(['POST'])
 @permission_classes([IsAdminOrAgent])
 def agent_activate_user(request, user_id):
-    try:
-        user = User.objects.get(id=user_id)
-        
-        if not request.user.is_admin:
-            if user.created_by != request.user:
-                return Response({
-                    'error': 'You can only activate users created by you'
-                }, status=status.HTTP_403_FORBIDDEN)
-        
-        user.is_active = True
-        user.save()
-        return Response({
-            'message': 'User activated successfully',
-            'user': UserProfileSerializer(user).data
-        }, status=status.HTTP_200_OK)
-    except User.DoesNotExist:
+    owner = None if request.user.is_admin else request.user
+    user = _update_user_and_fetch(user_id, owner=owner, is_active=True)
+    if user is None:
+        if owner is not None and User.objects.filter(id=user_id).exists():
+            return Response({
+                'error': 'You can only activate users created by you'
+            }, status=status.HTTP_403_FORBIDDEN)
         return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
+    return Response({
+        'message': 'User activated successfully',
+        'user': UserProfileSerializer(user).data
+    }, status=status.HTTP_200_OK)
 
 
 @api_view(['POST'])
 @permission_classes([IsAdminOrAgent])
 def agent_deactivate_user(request, user_id):
-    try:
-        user = User.objects.get(id=user_id)
-        
-        if not request.user.is_admin:
-            if user.created_by != request.user:
-                return Response({
-                    'error': 'You can only deactivate users created by you'
-                }, status=status.HTTP_403_FORBIDDEN)
-        
-        user.is_active = False
-        user.save()
-        return Response({
-            'message': 'User deactivated successfully',
-            'user': UserProfileSerializer(user).data
-        }, status=status.HTTP_200_OK)
-    except User.DoesNotExist:
+    owner = None if request.user.is_admin else request.user
+    user = _update_user_and_fetch(user_id, owner=owner, is_active=False)
+    if user is None:
+        if owner is not None and User.objects.filter(id=user_id).exists():
+            return Response({
+                'error': 'You can only deactivate users created by you'
+            }, status=status.HTTP_403_FORBIDDEN)
         return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
+    return Response({
+        'message': 'User deactivated successfully',
+        'user': UserProfileSerializer(user).data
+    }, status=status.HTTP_200_OK)
 
 
 @api_view(['GET', 'PATCH', 'PUT', 'DELETE'])
@@ -636,7 +716,7 @@ def edit_user(request, user_id):
             if not request.user.is_admin:
                 return Response({'error': 'Only admin can delete agents'}, status=status.HTTP_403_FORBIDDEN)
         else:
-            if not request.user.is_admin and target_user.created_by != request.user:
+            if not request.user.is_admin and target_user.created_by_id != request.user.id:
                 return Response({
                     'error': 'You can only delete users created by you'
                 }, status=status.HTTP_403_FORBIDDEN)
@@ -660,6 +740,7 @@ def edit_user(request, user_id):
 
         Transaction.objects.filter(member_account=target_user).delete()
         target_user.delete()
+        invalidate_admin_stats_cache()
         message = 'User deleted successfully'
         if training_count or created_count:
             parts = []
@@ -674,23 +755,27 @@ def edit_user(request, user_id):
         }, status=status.HTTP_200_OK)
 
     try:
-        target_user = User.objects.select_related('level', 'created_by').get(id=user_id, role='USER')
+        # Password hashes are never read here (only overwritten), so skip loading them.
+        # created_by is only compared / serialized by id, so it isn't joined.
+        target_user = User.objects.select_related('level').defer(
+            'password', 'withdraw_password'
+        ).get(id=user_id, role='USER')
     except User.DoesNotExist:
         return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
 
-    if not request.user.is_admin and target_user.created_by != request.user:
+    if not request.user.is_admin and target_user.created_by_id != request.user.id:
         return Response({
             'error': 'You can only edit or delete users created by you'
         }, status=status.HTTP_403_FORBIDDEN)
 
     if request.method == 'GET':
         from product.models import ProductReview
-        today = timezone.now().date()
-        today_start = timezone.make_aware(datetime.combine(today, datetime.min.time()))
+        from product.views import today_start
+        day_start = today_start()
         today_commission = ProductReview.objects.filter(
             user=target_user,
             status='COMPLETED',
-            completed_at__gte=today_start
+            completed_at__gte=day_start
         ).aggregate(total=Sum('commission_earned'))['total'] or 0
         today_commission = float(today_commission)
         serializer = AdminUserUpdateSerializer(
@@ -706,12 +791,7 @@ def edit_user(request, user_id):
         target_user, data=request.data, partial=partial
     )
     if not serializer.is_valid():
-        errors = {}
-        for field, error_list in serializer.errors.items():
-            if isinstance(error_list, list):
-                errors[field] = error_list[0] if len(error_list) == 1 else error_list
-            else:
-                errors[field] = str(error_list)
+        errors = unwrap_single_errors(serializer.errors)
         return Response({
             'success': False,
             'message': 'Validation failed',
@@ -720,17 +800,16 @@ def edit_user(request, user_id):
 
     updated_user = serializer.save()
 
-    from product.views import reset_user_level_progress_impl
+    from product.views import reset_user_level_progress_impl, today_start
     if updated_user.level_id is not None:
         reset_user_level_progress_impl(updated_user, updated_user.level)
 
     from product.models import ProductReview
-    today = timezone.now().date()
-    today_start = timezone.make_aware(datetime.combine(today, datetime.min.time()))
+    day_start = today_start()
     today_commission = ProductReview.objects.filter(
         user=updated_user,
         status='COMPLETED',
-        completed_at__gte=today_start
+        completed_at__gte=day_start
     ).aggregate(total=Sum('commission_earned'))['total'] or 0
     today_commission = float(today_commission)
     out = AdminUserUpdateSerializer(
@@ -757,38 +836,34 @@ def admin_created_agents_list(request):
         created_by__role='ADMIN'
     ).annotate(
         total_users=Count('created_users')
-    ).select_related('created_by').order_by('-date_joined')
-    
-    search = request.query_params.get('search', None)
-    if search:
-        queryset = queryset.filter(
-            Q(email__icontains=search) |
-            Q(username__icontains=search) |
-            Q(phone_number__icontains=search)
-        )
+    ).order_by('-date_joined')
     
-    is_active = request.query_params.get('is_active', None)
-    if is_active is not None:
-        queryset = queryset.filter(is_active=is_active.lower() == 'true')
+    queryset = _apply_user_filters(queryset, request.query_params, filters=('is_active',))
     
-    agents_data = []
-    for agent in queryset:
-        agents_data.append({
-            'id': agent.id,
-            'name': agent.username,
-            'email': agent.email,
-            'phone': agent.phone_number,
-            'invitation_code': agent.invitation_code,
-            'total_users': agent.total_users,
-            'status': 'Active' if agent.is_active else 'Inactive',
-            'created_by': agent.created_by.username if agent.created_by else None,
-            'created_by_email': agent.created_by.email if agent.created_by else None,
-            'created_at': agent.date_joined.isoformat() if agent.date_joined else None
-        })
+    rows = queryset.values(
+        'id', 'username', 'email', 'phone_number', 'invitation_code', 'total_users',
+        'is_active', 'created_by__username', 'created_by__email', 'date_joined'
+    )
+    rows, meta = _paginate(request, rows)
+    agents_data = [
+        {
+            'id': row['id'],
+            'name': row['username'],
+            'email': row['email'],
+            'phone': row['phone_number'],
+            'invitation_code': row['invitation_code'],
+            'total_users': row['total_users'],
+            'status': 'Active' if row['is_active'] else 'Inactive',
+            'created_by': row['created_by__username'],
+            'created_by_email': row['created_by__email'],
+            'created_at': row['date_joined'].isoformat() if row['date_joined'] else None
+        }
+        for row in rows
+    ]
     
     return Response({
         'agents': agents_data,
-        'count': len(agents_data)
+        **meta
     }, status=status.HTTP_200_OK)
 
 
@@ -803,69 +878,24 @@ def admin_all_agent_created_users(request):
     """
     queryset = User.objects.filter(
         Q(created_by__role='AGENT') | Q(created_by=request.user)
-    ).filter(role='USER').select_related('created_by', 'level', 'original_account').prefetch_related('training_accounts').order_by('-date_joined')
-    
-    search = request.query_params.get('search', None)
-    if search:
-        queryset = queryset.filter(
-            Q(email__icontains=search) |
-            Q(username__icontains=search) |
-            Q(phone_number__icontains=search) |
-            Q(invitation_code__icontains=search)
-        )
-    
-    is_active = request.query_params.get('is_active', None)
-    if is_active is not None:
-        queryset = queryset.filter(is_active=is_active.lower() == 'true')
-    
-    role = request.query_params.get('role', None)
-    if role:
-        queryset = queryset.filter(role=role.upper())
+    ).filter(role='USER').select_related('created_by', 'level', 'original_account').order_by('-date_joined')
     
-    is_training_account = request.query_params.get('is_training_account', None)
-    if is_training_account is not None:
-        queryset = queryset.filter(is_training_account=is_training_account.lower() == 'true')
+    queryset = _apply_user_filters(
+        queryset,
+        request.query_params,
+        search_fields=USER_SEARCH_FIELDS + ('invitation_code',)
+    )
     
     # Filter by specific agent if agent_id is provided
     agent_id = request.query_params.get('agent_id', None)
     if agent_id:
         queryset = queryset.filter(created_by_id=agent_id)
     
-    all_users = queryset
-    original_accounts = all_users.filter(is_training_account=False)
-    training_accounts = all_users.filter(is_training_account=True)
-    
-    original_accounts_serializer = UserProfileSerializer(original_accounts, many=True)
-    training_accounts_serializer = UserProfileSerializer(training_accounts, many=True)
-    
-    structured_data = []
-    original_accounts_dict = {}
-    
-    for original_account_data in original_accounts_serializer.data:
-        original_account_id = original_account_data['id']
-        original_accounts_dict[original_account_id] = {
-            **original_account_data,
-            'training_accounts': []
-        }
-    
-    for training_account_data in training_accounts_serializer.data:
-        original_account_id = training_account_data.get('original_account_id')
-        if original_account_id and original_account_id in original_accounts_dict:
-            original_accounts_dict[original_account_id]['training_accounts'].append(training_account_data)
-        else:
-            structured_data.append({
-                **training_account_data,
-                'training_accounts': []
-            })
-    
-    for account_data in original_accounts_dict.values():
-        structured_data.append(account_data)
-    
-    structured_data.sort(key=lambda x: x['date_joined'], reverse=True)
+    structured_data, meta = _structured_users_page(request, queryset)
     
     return Response({
         'users': structured_data,
-        'count': all_users.count()
+        **meta
     }, status=status.HTTP_200_OK)
 
 
@@ -877,17 +907,7 @@ class AgentCreateView(generics.CreateAPIView):
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         if not serializer.is_valid():
-            errors = {}
-            for field, error_list in serializer.errors.items():
-                if isinstance(error_list, list):
-                    if len(error_list) == 1:
-                        errors[field] = error_list[0]
-                    else:
-                        errors[field] = error_list
-                elif isinstance(error_list, dict):
-                    errors[field] = error_list
-                else:
-                    errors[field] = str(error_list)
+            errors = unwrap_single_errors(serializer.errors)
             
             return Response({
                 'success': False,
@@ -895,6 +915,7 @@ class AgentCreateView(generics.CreateAPIView):
                 'errors': errors
             }, status=status.HTTP_400_BAD_REQUEST)
         agent = serializer.save(created_by=request.user)
+        invalidate_admin_stats_cache()
         return Response({
             'success': True,
             'message': 'Agent created successfully',
@@ -911,17 +932,7 @@ def create_training_account(request):
     )
     
     if not serializer.is_valid():
-        errors = {}
-        for field, error_list in serializer.errors.items():
-            if isinstance(error_list, list):
-                if len(error_list) == 1:
-                    errors[field] = error_list[0]
-                else:
-                    errors[field] = error_list
-            elif isinstance(error_list, dict):
-                errors[field] = error_list
-            else:
-                errors[field] = str(error_list)
+        errors = unwrap_single_errors(serializer.errors)
         
         error_messages = []
         for field, message in errors.items():
@@ -938,6 +949,7 @@ def create_training_account(request):
         }, status=status.HTTP_400_BAD_REQUEST)
     
     training_account = serializer.save()
+    invalidate_admin_stats_cache()
     
     return Response({
         'success': True,
@@ -963,14 +975,17 @@ def list_training_accounts(request, original_account_id):
                 'error': 'You do not have permission to view this information'
             }, status=status.HTTP_403_FORBIDDEN)
     
-    training_accounts = original_account.training_accounts.filter(is_active=True).order_by('-date_joined')
+    training_accounts = original_account.training_accounts.select_related(
+        'original_account', 'created_by', 'level'
+    ).filter(is_active=True).order_by('-date_joined')
     
-    serializer = UserProfileSerializer(training_accounts, many=True)
+    # Serialize the parent in the same many=True pass so the field set is only built once
+    accounts_data = UserProfileSerializer([original_account, *training_accounts], many=True).data
     
     return Response({
-        'original_account': UserProfileSerializer(original_account).data,
-        'training_accounts': serializer.data,
-        'count': training_accounts.count()
+        'original_account': accounts_data[0],
+        'training_accounts': accounts_data[1:],
+        'count': len(accounts_data) - 1
     }, status=status.HTTP_200_OK)
 
 
@@ -984,14 +999,17 @@ def my_training_accounts(request):
     else:
         original_account = user
     
-    training_accounts = original_account.training_accounts.filter(is_active=True).order_by('-date_joined')
+    training_accounts = original_account.training_accounts.select_related(
+        'original_account', 'created_by', 'level'
+    ).filter(is_active=True).order_by('-date_joined')
     
-    serializer = UserProfileSerializer(training_accounts, many=True)
+    # Serialize the parent in the same many=True pass so the field set is only built once
+    accounts_data = UserProfileSerializer([original_account, *training_accounts], many=True).data
     
     return Response({
-        'original_account': UserProfileSerializer(original_account).data,
-        'training_accounts': serializer.data,
-        'count': training_accounts.count()
+        'original_account': accounts_data[0],
+        'training_accounts': accounts_data[1:],
+        'count': len(accounts_data) - 1
     }, status=status.HTTP_200_OK)
 
 
@@ -1015,17 +1033,7 @@ def update_agent_profile(request, agent_id):
         serializer = AgentProfileUpdateSerializer(agent, data=request.data, partial=partial)
         
         if not serializer.is_valid():
-            errors = {}
-            for field, error_list in serializer.errors.items():
-                if isinstance(error_list, list):
-                    if len(error_list) == 1:
-                        errors[field] = error_list[0]
-                    else:
-                        errors[field] = error_list
-                elif isinstance(error_list, dict):
-                    errors[field] = error_list
-                else:
-                    errors[field] = str(error_list)
+            errors = unwrap_single_errors(serializer.errors)
             
             return Response({
                 'success': False,
@@ -0,0 +1,53 @@
+import orjson
+from django.http import HttpResponse, StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_fallback_encoder = JSONEncoder()
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer backed by orjson.
+    Datetimes and anything orjson can't encode natively (Decimal, lazy strings, querysets)
+    go through DRF's JSONEncoder so the output format stays the same.
+    """
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(data, default=_fallback_encoder.default, option=self.options)
+
+
+def _dumps(data):
+    return orjson.dumps(data, default=_fallback_encoder.default, option=ORJSONRenderer.options)
+
+
+def json_response(data, status=200):
+    """
+    Plain HttpResponse with an orjson body, for tiny hot payloads that don't need
+    DRF's content negotiation and renderer pipeline.
+    """
+    return HttpResponse(_dumps(data), status=status, content_type='application/json')
+
+
+def streaming_json_list_response(key, items, to_representation, extra=None, status=200):
+    """
+    StreamingHttpResponse for {key: [...], 'count': n, **extra}, encoding one item at a time
+    so large unpaginated lists are never held in memory as a whole.
+    """
+    def chunks():
+        yield b'{' + _dumps(key) + b':['
+        count = 0
+        for item in items:
+            if count:
+                yield b','
+            yield _dumps(to_representation(item))
+            count += 1
+        # Splice the trailing keys into the open object by dropping their leading brace
+        yield b'],' + _dumps({'count': count, **(extra or {})})[1:]
+
+    return StreamingHttpResponse(chunks(), status=status, content_type='application/json')
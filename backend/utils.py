@@ -0,0 +1,6 @@
+def flatten_errors(serializer_errors):
+    """Reduce each field's error list to its first message"""
+    return {
+        field: (error_list[0] if error_list else 'Invalid value') if isinstance(error_list, list) else str(error_list)
+        for field, error_list in serializer_errors.items()
+    }
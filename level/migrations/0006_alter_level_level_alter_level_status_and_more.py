@@ -0,0 +1,27 @@
+# Generated by Django 6.0.1 on 2026-10-16 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('level', '0005_alter_level_price_max_percent_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='level',
+            name='level',
+            field=models.IntegerField(help_text='Level number', unique=True),
+        ),
+        migrations.AlterField(
+            model_name='level',
+            name='status',
+            field=models.CharField(choices=[('ACTIVE', 'Active'), ('INACTIVE', 'Inactive')], default='ACTIVE', help_text='Status of the level', max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='level',
+            index=models.Index(fields=['status', 'level'], name='levels_status_3c914f_idx'),
+        ),
+    ]
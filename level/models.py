@@ -1,6 +1,11 @@
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils import timezone
 
+LEVEL_CACHE_GENERATION_KEY = 'levels:generation'
+
 
 class Level(models.Model):
     STATUS_CHOICES = [
@@ -8,7 +13,7 @@ class Level(models.Model):
         ('INACTIVE', 'Inactive'),
     ]
     
-    level = models.IntegerField(unique=True, db_index=True, help_text="Level number")
+    level = models.IntegerField(unique=True, help_text="Level number")
     level_name = models.CharField(max_length=100, help_text="Name of the level")
     required_points = models.IntegerField(default=0, help_text="Points required to reach this level")
     commission_rate = models.DecimalField(
@@ -48,7 +53,6 @@ class Level(models.Model):
         max_length=10, 
         choices=STATUS_CHOICES, 
         default='ACTIVE',
-        db_index=True,
         help_text="Status of the level"
     )
     created_at = models.DateTimeField(default=timezone.now, db_index=True)
@@ -58,6 +62,27 @@ class Level(models.Model):
         verbose_name = 'Level'
         verbose_name_plural = 'Levels'
         ordering = ['level']
+        indexes = [
+            models.Index(fields=['status', 'level']),
+        ]
     
     def __str__(self):
         return f"Level {self.level}: {self.level_name}"
+
+
+def level_cache_generation():
+    """Current generation for cached level data; bumped whenever any level changes (in this process's cache only)"""
+    return cache.get_or_set(LEVEL_CACHE_GENERATION_KEY, 0, None)
+
+
+def _bump_level_cache_generation():
+    try:
+        cache.incr(LEVEL_CACHE_GENERATION_KEY)
+    except ValueError:
+        cache.set(LEVEL_CACHE_GENERATION_KEY, 1, None)
+
+
+@receiver([post_save, post_delete], sender=Level)
+def invalidate_level_cache(sender, **kwargs):
+    # Deferred to commit so the level list isn't re-cached from uncommitted rows
+    transaction.on_commit(_bump_level_cache_generation)
@@ -22,18 +22,13 @@ class LevelSerializer(serializers.ModelSerializer):
             'created_at'
         ]
         read_only_fields = ['id', 'created_at']
+        # Uniqueness is enforced by the DB constraint; the views turn IntegrityError into a 400
+        extra_kwargs = {'level': {'validators': []}}
     
     def validate_level(self, value):
-        """Ensure level number is positive and unique"""
+        """Ensure level number is positive"""
         if value < 1:
             raise serializers.ValidationError("Level must be a positive integer.")
-        
-        # Check uniqueness (excluding current instance if updating)
-        queryset = Level.objects.filter(level=value)
-        if self.instance:
-            queryset = queryset.exclude(pk=self.instance.pk)
-        if queryset.exists():
-            raise serializers.ValidationError("A level with this number already exists.")
         return value
     
     def validate_required_points(self, value):
@@ -83,6 +78,23 @@ class LevelSerializer(serializers.ModelSerializer):
         return attrs
 
 
+class LevelReadSerializer(serializers.Serializer):
+    """Read-only level representation with declared fields, for list responses"""
+    id = serializers.IntegerField(read_only=True)
+    level = serializers.IntegerField(read_only=True)
+    level_name = serializers.CharField(read_only=True)
+    required_points = serializers.IntegerField(read_only=True)
+    commission_rate = serializers.DecimalField(max_digits=5, decimal_places=2, read_only=True)
+    frozen_commission_rate = serializers.DecimalField(max_digits=5, decimal_places=2, read_only=True)
+    min_orders = serializers.IntegerField(read_only=True)
+    start_continuous_orders_after = serializers.IntegerField(read_only=True)
+    price_min_percent = serializers.DecimalField(max_digits=5, decimal_places=2, read_only=True)
+    price_max_percent = serializers.DecimalField(max_digits=5, decimal_places=2, read_only=True)
+    benefits = serializers.CharField(read_only=True)
+    status = serializers.CharField(read_only=True)
+    created_at = serializers.DateTimeField(read_only=True)
+
+
 class LevelCreateSerializer(LevelSerializer):
     """Serializer for creating levels"""
     pass
@@ -110,20 +122,17 @@ class AssignLevelSerializer(serializers.Serializer):
     
     def validate_user_id(self, value):
         """Validate that the user exists"""
-        try:
-            user = User.objects.get(id=value)
-        except User.DoesNotExist:
+        if not User.objects.filter(id=value).exists():
             raise serializers.ValidationError("User with this ID does not exist.")
         return value
     
     def validate_level_id(self, value):
         """Validate that the level exists if provided"""
         if value is not None:
-            try:
-                level = Level.objects.get(id=value)
-                if level.status != 'ACTIVE':
-                    raise serializers.ValidationError("Cannot assign an inactive level.")
-            except Level.DoesNotExist:
+            level_status = Level.objects.filter(id=value).values_list('status', flat=True).first()
+            if level_status is None:
                 raise serializers.ValidationError("Level with this ID does not exist.")
+            if level_status != 'ACTIVE':
+                raise serializers.ValidationError("Cannot assign an inactive level.")
         return value
 
@@ -1,11 +1,71 @@
+import hashlib
+
 from rest_framework import status, generics, permissions
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import IntegrityError, transaction
 from django.db.models import Q
-from .models import Level
-from .serializers import LevelSerializer, LevelCreateSerializer, LevelUpdateSerializer, AssignLevelSerializer
+from django.utils.functional import cached_property
+from .models import Level, level_cache_generation
+from .serializers import LevelSerializer, LevelReadSerializer, LevelCreateSerializer, LevelUpdateSerializer, AssignLevelSerializer
 from authentication.permissions import IsAdminOrAgent
 from authentication.models import User
+from authentication.serializers import UserProfileSerializer
+from product.views import reset_user_level_progress_impl
+from backend.utils import flatten_errors
+
+
+# No shared CACHES backend is configured, so the generation bump only reaches the worker that
+# wrote the level; the short TTL bounds how long other workers serve a stale list
+LEVEL_LIST_CACHE_TIMEOUT = 30
+LEVEL_STATUSES = frozenset(choice for choice, _ in Level.STATUS_CHOICES)
+
+
+def level_number_taken(serializer):
+    """Whether the serializer's level number belongs to another level, i.e. the save hit Level.level's unique constraint"""
+    level_number = serializer.validated_data.get('level')
+    if level_number is None:
+        return False
+    levels = Level.objects.filter(level=level_number)
+    if serializer.instance is not None:
+        levels = levels.exclude(pk=serializer.instance.pk)
+    return levels.exists()
+
+
+def duplicate_level_response():
+    """400 for a create/update that hit the unique constraint on Level.level"""
+    # Same message DRF's UniqueValidator produced before uniqueness moved to the database
+    return Response({
+        'message': 'Validation failed',
+        'errors': {'level': 'Level with this level already exists.'}
+    }, status=status.HTTP_400_BAD_REQUEST)
+
+
+class LevelPaginator(Paginator):
+    """Paginator that counts a short list from its first page of rows instead of a COUNT(*)"""
+    _first_page_rows = None
+
+    @cached_property
+    def count(self):
+        # Fetch one row past the first page; if it isn't there, these rows are the whole list
+        rows = list(self.object_list[:self.per_page + 1])
+        if len(rows) <= self.per_page:
+            self._first_page_rows = rows
+            return len(rows)
+        return self.object_list.count()
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if number == 1 and self._first_page_rows is not None:
+            return self._get_page(self._first_page_rows, number, self)
+        return super().page(number)
+
+
+class LevelListPagination(PageNumberPagination):
+    django_paginator_class = LevelPaginator
 
 
 class LevelListView(generics.ListCreateAPIView):
@@ -14,49 +74,65 @@ class LevelListView(generics.ListCreateAPIView):
     POST: Create a new level
     """
     permission_classes = [IsAdminOrAgent]
+    pagination_class = LevelListPagination
     
     def get_queryset(self):
-        queryset = Level.objects.all()
+        filters = {}
         
-        # Filter by status
+        # Filter by status; an unknown status can't match anything, so skip the query
         status_filter = self.request.query_params.get('status', None)
         if status_filter:
-            queryset = queryset.filter(status=status_filter.upper())
+            status_filter = status_filter.upper()
+            if status_filter not in LEVEL_STATUSES:
+                return Level.objects.none()
+            filters['status'] = status_filter
+        queryset = Level.objects.filter(**filters)
         
         # Search by level name
         search = self.request.query_params.get('search', None)
         if search:
-            queryset = queryset.filter(
-                Q(level_name__icontains=search) |
-                Q(level__icontains=search)
-            )
+            # Match the integer level column exactly so it can use its index instead of a text cast
+            q = Q(level_name__icontains=search)
+            if search.isdecimal():
+                q |= Q(level=int(search))
+            queryset = queryset.filter(q)
         
-        return queryset.order_by('level')
+        # Plain row dicts are enough for LevelReadSerializer and skip building model instances
+        return queryset.values(*LevelSerializer.Meta.fields)
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return LevelCreateSerializer
-        return LevelSerializer
+        return LevelReadSerializer
+    
+    def list(self, request, *args, **kwargs):
+        # Cache each filtered/paginated page briefly; a level save or delete drops it in this worker
+        url_hash = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+        cache_key = f'levels:list:{level_cache_generation()}:{url_hash}'
+        data = cache.get(cache_key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(cache_key, data, LEVEL_LIST_CACHE_TIMEOUT)
+        return Response(data)
     
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         if not serializer.is_valid():
-            errors = {}
-            for field, error_list in serializer.errors.items():
-                if isinstance(error_list, list):
-                    errors[field] = error_list[0] if error_list else 'Invalid value'
-                else:
-                    errors[field] = str(error_list)
-            
             return Response({
                 'message': 'Validation failed',
-                'errors': errors
+                'errors': flatten_errors(serializer.errors)
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        level = serializer.save()
+        try:
+            with transaction.atomic():
+                serializer.save()
+        except IntegrityError:
+            if not level_number_taken(serializer):
+                raise
+            return duplicate_level_response()
         return Response({
             'message': 'Level created successfully',
-            'level': LevelSerializer(level).data
+            'level': serializer.data
         }, status=status.HTTP_201_CREATED)
 
 
@@ -81,22 +157,21 @@ class LevelDetailView(generics.RetrieveUpdateDestroyAPIView):
         serializer = self.get_serializer(instance, data=request.data, partial=partial)
         
         if not serializer.is_valid():
-            errors = {}
-            for field, error_list in serializer.errors.items():
-                if isinstance(error_list, list):
-                    errors[field] = error_list[0] if error_list else 'Invalid value'
-                else:
-                    errors[field] = str(error_list)
-            
             return Response({
                 'message': 'Validation failed',
-                'errors': errors
+                'errors': flatten_errors(serializer.errors)
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        level = serializer.save()
+        try:
+            with transaction.atomic():
+                serializer.save()
+        except IntegrityError:
+            if not level_number_taken(serializer):
+                raise
+            return duplicate_level_response()
         return Response({
             'message': 'Level updated successfully',
-            'level': LevelSerializer(level).data
+            'level': serializer.data
         }, status=status.HTTP_200_OK)
     
     def destroy(self, request, *args, **kwargs):
@@ -117,47 +192,45 @@ def assign_level_to_user(request):
     serializer = AssignLevelSerializer(data=request.data)
     
     if not serializer.is_valid():
-        errors = {}
-        for field, error_list in serializer.errors.items():
-            if isinstance(error_list, list):
-                errors[field] = error_list[0] if error_list else 'Invalid value'
-            else:
-                errors[field] = str(error_list)
-        
         return Response({
             'message': 'Validation failed',
-            'errors': errors
+            'errors': flatten_errors(serializer.errors)
         }, status=status.HTTP_400_BAD_REQUEST)
     
     user_id = serializer.validated_data['user_id']
     level_id = serializer.validated_data['level_id']
     
     try:
-        user = User.objects.get(id=user_id)
-        
-        # Check permissions - agents can only assign levels to users they created
-        if not request.user.is_admin:
-            if user.created_by != request.user:
-                return Response({
-                    'error': 'You can only assign levels to users created by you'
-                }, status=status.HTTP_403_FORBIDDEN)
-        
-        # Assign or remove level
-        if level_id is not None:
-            level = Level.objects.get(id=level_id)
-            user.level = level
-            message = f'Level "{level.level_name}" assigned to user successfully'
-        else:
-            user.level = None
-            message = 'Level removed from user successfully'
-        
-        user.save()
-
-        from product.views import reset_user_level_progress_impl
-        if level_id is not None:
-            reset_user_level_progress_impl(user, level)
+        # Lock the user row so concurrent assigns can't interleave the level change and progress reset
+        with transaction.atomic():
+            user = (
+                User.objects.select_for_update(of=('self',))
+                .select_related('level', 'created_by', 'original_account')
+                .get(id=user_id)
+            )
+            
+            # Check permissions - agents can only assign levels to users they created
+            if not request.user.is_admin:
+                if user.created_by_id != request.user.id:
+                    return Response({
+                        'error': 'You can only assign levels to users created by you'
+                    }, status=status.HTTP_403_FORBIDDEN)
+            
+            # Assign or remove level
+            if level_id is not None:
+                level = Level.objects.get(id=level_id)
+                user.level = level
+                message = f'Level "{level.level_name}" assigned to user successfully'
+            else:
+                user.level = None
+                message = 'Level removed from user successfully'
+            
+            if level_id is not None:
+                # The level change goes out in the same UPDATE as the progress reset
+                reset_user_level_progress_impl(user, level, extra_update_fields=['level'])
+            else:
+                user.save(update_fields=['level'])
 
-        from authentication.serializers import UserProfileSerializer
         return Response({
             'message': message,
             'user': UserProfileSerializer(user).data,
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-16 11:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0014_product_image_url'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='productreview',
+            index=models.Index(fields=['user', 'status', 'product'], name='product_rev_user_id_ac6549_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated manually for trigram indexes on the product search columns (PostgreSQL only)
+
+from django.db import migrations
+
+TRIGRAM_INDEXES = [
+    ('products_title_trgm', 'title'),
+    ('products_description_trgm', 'description'),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # icontains compiles to UPPER(col::text) LIKE UPPER(%s) on PostgreSQL, so index that expression
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON products USING gin (UPPER({column}::text) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _ in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0015_productreview_product_rev_user_id_ac6549_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
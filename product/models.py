@@ -1,7 +1,12 @@
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
 from django.utils import timezone
 from authentication.models import User
 
+PRODUCT_CACHE_GENERATION_KEY = 'products:generation'
+
 
 class Product(models.Model):
     STATUS_CHOICES = [
@@ -54,6 +59,31 @@ class Product(models.Model):
         return self.title
 
 
+def product_cache_generation():
+    """
+    Current generation for cached product data; bumped whenever a product or its level assignments change.
+    The bump lands in this process's cache only; other workers rely on the cache TTL.
+    """
+    return cache.get_or_set(PRODUCT_CACHE_GENERATION_KEY, 0, None)
+
+
+def _bump_product_cache_generation():
+    try:
+        cache.incr(PRODUCT_CACHE_GENERATION_KEY)
+    except ValueError:
+        cache.set(PRODUCT_CACHE_GENERATION_KEY, 1, None)
+
+
+@receiver([post_save, post_delete], sender=Product)
+@receiver(m2m_changed, sender=Product.levels.through)
+def invalidate_product_cache(sender, **kwargs):
+    if kwargs.get('action', 'post_').startswith('pre_'):
+        return
+    # Bump only once the write is committed, or a read racing the open transaction could
+    # cache pre-commit data under the new generation
+    transaction.on_commit(_bump_product_cache_generation)
+
+
 class ProductReview(models.Model):
     STATUS_CHOICES = [
         ('PENDING', 'Pending'),
@@ -120,6 +150,10 @@ class ProductReview(models.Model):
         verbose_name_plural = 'Product Reviews'
         ordering = ['-created_at']
         unique_together = ['user', 'product']  # User can only review each product once
+        indexes = [
+            # Covers "this user's reviews with status X" and the product_id lists built from them
+            models.Index(fields=['user', 'status', 'product']),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.product.title} - {self.status}"
@@ -1,16 +1,47 @@
+import operator
+from decimal import Decimal
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.encoding import filepath_to_uri
 from rest_framework import serializers
+from rest_framework.fields import SkipField
 from .models import Product, ProductReview
 from authentication.models import User
+from authentication.serializers import CachedFieldsMixin
+from level.models import Level
+
+HUNDRED = Decimal('100')
+DEFAULT_FROZEN_COMMISSION_RATE = Decimal('6.00')
+
+
+class RequestedFieldsMixin:
+    """Let GET callers trim the representation with ?fields=a,b so unrequested method fields are never computed"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method != 'GET':
+            return
+        requested = request.query_params.get('fields')
+        if requested:
+            keep = set(requested.split(','))
+            for name in [name for name in self.fields if name not in keep]:
+                self.fields.pop(name)
 
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(RequestedFieldsMixin, CachedFieldsMixin, serializers.ModelSerializer):
+    # Fields that need the context user's review of the product
+    USER_REVIEW_FIELDS = frozenset([
+        'review_status', 'position', 'inserted_for_user', 'effective_price',
+        'potential_commission', 'commission_amount', 'commission_rate',
+    ])
+
     image_url = serializers.SerializerMethodField()
     review_status = serializers.SerializerMethodField()
     effective_price = serializers.SerializerMethodField()
     potential_commission = serializers.SerializerMethodField()
     commission_amount = serializers.SerializerMethodField()
     commission_rate = serializers.SerializerMethodField()
-    position = serializers.SerializerMethodField()
     inserted_for_user = serializers.SerializerMethodField()
 
     class Meta:
@@ -35,11 +66,79 @@ class ProductSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'image_url', 'effective_price', 'review_status', 'potential_commission', 'commission_amount', 'commission_rate', 'position', 'inserted_for_user']
     
+    _pricing = None
+    _media_base = None
+    _user_rates = None
+    _fast_fields = None
+
+    def _representation_plan(self):
+        """(name, getter, to_representation) per readable field, resolved once per serializer so list rows skip DRF's per-field lookups"""
+        if self._fast_fields is None:
+            plan = []
+            for field in self._readable_fields:
+                if isinstance(field, serializers.SerializerMethodField):
+                    # Method fields are handed the instance itself
+                    plan.append((field.field_name, None, getattr(self, field.method_name)))
+                elif len(field.source_attrs) == 1:
+                    plan.append((field.field_name, operator.attrgetter(field.source_attrs[0]), field.to_representation))
+                else:
+                    plan.append((field.field_name, field.get_attribute, field.to_representation))
+            self._fast_fields = plan
+        return self._fast_fields
+
+    def to_representation(self, instance):
+        self._pricing = None
+        ret = {}
+        for name, getter, to_representation in self._representation_plan():
+            if getter is None:
+                ret[name] = to_representation(instance)
+                continue
+            try:
+                attribute = getter(instance)
+            except SkipField:
+                continue
+            ret[name] = None if attribute is None else to_representation(attribute)
+        if 'position' in ret:
+            position = self._user_position(instance)
+            if position is not None:
+                ret['position'] = position
+        return ret
+
+    def _user_review(self, obj):
+        """The context user's review of obj, read from the user_reviews prefetch when the view set one up"""
+        user = self.context.get('user')
+        if not user or not user.is_authenticated:
+            return None
+        if hasattr(obj, 'user_reviews'):
+            return obj.user_reviews[0] if obj.user_reviews else None
+        return obj.reviews.filter(user=user).first()
+
+    def _user_pricing(self, obj):
+        """(review, effective price, commission rate, commission amount) for obj, resolved once per product since several fields share them"""
+        if self._pricing is None or self._pricing[0] is not obj:
+            review = self._user_review(obj)
+            effective = self._get_effective_price(obj, review)
+            commission_rate = self._get_effective_commission_rate(obj, review)
+            commission_amount = None
+            if commission_rate is not None:
+                commission_amount = float((effective * commission_rate) / HUNDRED)
+            self._pricing = (obj, review, effective, commission_rate, commission_amount)
+        return self._pricing[1:]
+
+    def _media_base_url(self, storage):
+        """Absolute base URL for uploaded files, built once per serializer instead of once per product"""
+        if self._media_base is None:
+            request = self.context.get('request')
+            self._media_base = request.build_absolute_uri(storage.base_url) if request else storage.base_url
+        return self._media_base
+
     def get_image_url(self, obj):
         """Return full URL for the image (image_url field, or uploaded image)"""
         if getattr(obj, 'image_url', None):
             return obj.image_url
         if obj.image:
+            if isinstance(obj.image.storage, FileSystemStorage):
+                return self._media_base_url(obj.image.storage) + filepath_to_uri(obj.image.name).lstrip('/')
             request = self.context.get('request')
             if request:
                 return request.build_absolute_uri(obj.image.url)
@@ -52,107 +151,88 @@ class ProductSerializer(serializers.ModelSerializer):
         if not user or not user.is_authenticated:
             return None
 
-        review = obj.reviews.filter(user=user).first()
+        review = self._user_pricing(obj)[0]
         if review:
             return review.status
         return 'NOT_COMPLETED'
 
-    def get_position(self, obj):
-        """Return user-specific position when product is in that user's order (e.g. inserted at position for them), else product's global position."""
-        user = self.context.get('user')
-        if user and user.is_authenticated:
-            review = obj.reviews.filter(user=user).first()
-            if review and getattr(review, 'position', None) is not None:
-                return review.position
-        return obj.position
+    def _user_position(self, obj):
+        """User-specific position when product is in that user's order (e.g. inserted at position for them); None keeps the product's global position."""
+        review = self._user_pricing(obj)[0]
+        if review and getattr(review, 'position', None) is not None:
+            return review.position
+        return None
 
     def get_inserted_for_user(self, obj):
         """True if this product was explicitly inserted at a position for the current user (use_actual_price + position set on their review)."""
-        user = self.context.get('user')
-        if not user or not user.is_authenticated:
-            return False
-        review = obj.reviews.filter(user=user).first()
+        review = self._user_pricing(obj)[0]
         if not review:
             return False
         return bool(getattr(review, 'use_actual_price', False) or getattr(review, 'position', None) is not None)
 
-    def _get_effective_price(self, obj):
+    def _get_effective_price(self, obj, review):
         """Price for this user: use actual price if this user's review has use_actual_price (inserted for them), else product.use_actual_price, else agreed_price or product price."""
-        user = self.context.get('user')
-        if user and user.is_authenticated:
-            review = obj.reviews.filter(user=user).first()
-            if review and getattr(review, 'use_actual_price', False):
-                return obj.price
+        if review and getattr(review, 'use_actual_price', False):
+            return obj.price
         if getattr(obj, 'use_actual_price', False):
             return obj.price
-        if user and user.is_authenticated:
-            review = obj.reviews.filter(user=user).first()
-            if review and review.agreed_price is not None:
-                return review.agreed_price
+        if review and review.agreed_price is not None:
+            return review.agreed_price
         return obj.price
     
     def get_effective_price(self, obj):
         """Return effective price (agreed or base) for API; used for display and commission."""
-        price = self._get_effective_price(obj)
+        price = self._user_pricing(obj)[1]
         return str(price) if price is not None else None
 
-    def _get_effective_commission_rate(self, obj):
+    def _get_user_rates(self):
+        """(commission rate, frozen commission rate, balance frozen) for the context user's level, or None; the same for every product"""
+        if self._user_rates is None:
+            user = self.context.get('user')
+            if not user or not user.is_authenticated or not user.level:
+                self._user_rates = ()
+            else:
+                fr = getattr(user.level, 'frozen_commission_rate', None)
+                self._user_rates = (
+                    user.level.commission_rate,
+                    fr if fr is not None else DEFAULT_FROZEN_COMMISSION_RATE,
+                    getattr(user, 'balance_frozen', False),
+                )
+        return self._user_rates or None
+
+    def _get_effective_commission_rate(self, obj, review):
         """Use frozen commission rate when balance is frozen or this review is frozen; works for all levels (fallback 6%)."""
-        from decimal import Decimal
-        user = self.context.get('user')
-        if not user or not user.is_authenticated or not user.level:
+        rates = self._get_user_rates()
+        if rates is None:
             return None
-        review = obj.reviews.filter(user=user).first()
-        use_frozen = (
-            getattr(user, 'balance_frozen', False) or
-            (review and getattr(review, 'use_frozen_commission', False))
-        )
-        if use_frozen:
-            fr = getattr(user.level, 'frozen_commission_rate', None)
-            return (user.level.frozen_commission_rate if fr is not None else Decimal('6.00'))
-        return user.level.commission_rate
+        commission_rate, frozen_rate, balance_frozen = rates
+        if balance_frozen or (review and getattr(review, 'use_frozen_commission', False)):
+            return frozen_rate
+        return commission_rate
 
     def get_potential_commission(self, obj):
         """Calculate potential commission for the current user based on their level and effective price."""
-        from decimal import Decimal
-        user = self.context.get('user')
-        if not user or not user.is_authenticated or not user.level:
-            return None
-        effective = self._get_effective_price(obj)
-        commission_rate = self._get_effective_commission_rate(obj)
-        if commission_rate is None:
-            return None
-        commission_amount = (Decimal(str(effective)) * commission_rate) / Decimal('100')
-        return float(commission_amount)
+        return self._user_pricing(obj)[3]
 
     def get_commission_amount(self, obj):
         """Calculate commission amount for the current user based on effective price."""
-        from decimal import Decimal
-        user = self.context.get('user')
-        if not user or not user.is_authenticated or not user.level:
-            return None
-        effective = self._get_effective_price(obj)
-        commission_rate = self._get_effective_commission_rate(obj)
-        if commission_rate is None:
-            return None
-        commission_amount = (Decimal(str(effective)) * commission_rate) / Decimal('100')
-        return float(commission_amount)
+        return self._user_pricing(obj)[3]
 
     def get_commission_rate(self, obj):
         """Return commission rate for the current user; frozen rate when balance or review is frozen (all levels, fallback 6%)."""
-        rate = self._get_effective_commission_rate(obj)
+        rate = self._user_pricing(obj)[2]
         return float(rate) if rate is not None else None
 
 
 class ProductDashboardSerializer(ProductSerializer):
     """Minimal product for dashboard-products API. Includes position so FE can show 'Step X of Y'."""
 
-    def get_position(self, obj):
+    def _user_position(self, obj):
         """Use position from dashboard pool (same order as API list) so FE shows correct step."""
         positions = self.context.get('product_positions') or {}
         if obj.id in positions:
             return positions[obj.id]
-        return super().get_position(obj)
+        return super()._user_position(obj)
 
     class Meta(ProductSerializer.Meta):
         fields = ['id', 'title', 'description', 'image_url', 'price', 'effective_price', 'commission_amount', 'commission_rate', 'status', 'position']
@@ -186,36 +266,34 @@ class AssignProductsToLevelSerializer(serializers.Serializer):
         help_text="List of product IDs to assign. Empty list removes all products from the level."
     )
     
-    def validate_level_id(self, value):
-        """Validate that the level exists and is active"""
-        try:
-            from level.models import Level
-            level = Level.objects.get(id=value)
-            if level.status != 'ACTIVE':
-                raise serializers.ValidationError("Cannot assign products to an inactive level.")
-        except Level.DoesNotExist:
-            raise serializers.ValidationError("Level with this ID does not exist.")
-        return value
-    
     def validate_product_ids(self, value):
         """Validate that all products exist"""
         if not value:
             return value  # Empty list is allowed (to remove all assignments)
         
-        existing_products = Product.objects.filter(id__in=value)
-        existing_ids = set(existing_products.values_list('id', flat=True))
-        invalid_ids = set(value) - existing_ids
-        
-        if invalid_ids:
+        requested_ids = set(value)
+        existing_products = Product.objects.filter(id__in=requested_ids)
+        if existing_products.count() != len(requested_ids):
+            # Only materialize the ids on the error path, to report which ones are missing
+            invalid_ids = requested_ids - set(existing_products.values_list('id', flat=True))
             raise serializers.ValidationError(f"Products with IDs {list(invalid_ids)} do not exist.")
         
         return value
+    
+    def validate(self, attrs):
+        """Validate that the level exists and is active; the fetched level is passed on as attrs['level']"""
+        level = Level.objects.filter(id=attrs.get('level_id')).first()
+        if level is None:
+            raise serializers.ValidationError({'level_id': "Level with this ID does not exist."})
+        if level.status != 'ACTIVE':
+            raise serializers.ValidationError({'level_id': "Cannot assign products to an inactive level."})
+        attrs['level'] = level
+        return attrs
 
 
 class ProductReviewSerializer(serializers.ModelSerializer):
     product_title = serializers.CharField(source='product.title', read_only=True)
     product_price = serializers.DecimalField(source='product.price', max_digits=10, decimal_places=2, read_only=True)
-    product_image = serializers.ImageField(source='product.image', read_only=True)
     product_image_url = serializers.SerializerMethodField()
     username = serializers.CharField(source='user.username', read_only=True)
     user_email = serializers.EmailField(source='user.email', read_only=True)
@@ -230,7 +308,6 @@ class ProductReviewSerializer(serializers.ModelSerializer):
             'product',
             'product_title',
             'product_price',
-            'product_image',
             'product_image_url',
             'review_text',
             'status',
@@ -261,23 +338,14 @@ class SubmitProductReviewSerializer(serializers.Serializer):
     product_id = serializers.IntegerField(required=True)
     review_text = serializers.CharField(required=False, allow_blank=True, allow_null=True)
     
-    def validate_product_id(self, value):
-        """Validate that the product exists and is available to user"""
-        try:
-            product = Product.objects.get(id=value)
-        except Product.DoesNotExist:
-            raise serializers.ValidationError("Product with this ID does not exist.")
-        return value
-    
     def validate(self, attrs):
-        """Validate that user can review this product"""
+        """Validate that the product exists and the user can review it; the fetched product is passed on as attrs['product']"""
         user = self.context['user']
         product_id = attrs.get('product_id')
         
-        try:
-            product = Product.objects.get(id=product_id)
-        except Product.DoesNotExist:
-            raise serializers.ValidationError("Product not found.")
+        product = Product.objects.only('id', 'status', 'price', 'use_actual_price').filter(id=product_id).first()
+        if product is None:
+            raise serializers.ValidationError({'product_id': "Product with this ID does not exist."})
         
         if product.status != 'ACTIVE':
             raise serializers.ValidationError("Cannot review inactive products.")
@@ -285,5 +353,6 @@ class SubmitProductReviewSerializer(serializers.Serializer):
         if not user.level:
             raise serializers.ValidationError("You must have a level assigned to review products.")
 
+        attrs['product'] = product
         return attrs
 
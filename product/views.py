@@ -1,13 +1,19 @@
+import hashlib
 from decimal import Decimal
 
 from rest_framework import status, generics, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from django.db.models import Q, Sum, Count, F
+from django.core.cache import cache
+from django.db import transaction as db_transaction
+from django.db.models import Q, Sum, Count, F, Exists, OuterRef, Prefetch, Subquery, Window, prefetch_related_objects
+from django.db.models.functions import RowNumber
 from django.utils import timezone
-from datetime import datetime, timedelta
-from .models import Product, ProductReview
+from datetime import timedelta
+from .models import Product, ProductReview, product_cache_generation
 from .serializers import (
+    HUNDRED,
+    DEFAULT_FROZEN_COMMISSION_RATE,
     ProductSerializer,
     ProductDashboardSerializer,
     ProductCreateSerializer,
@@ -17,10 +23,73 @@ from .serializers import (
     SubmitProductReviewSerializer
 )
 from authentication.permissions import IsAdminOrAgent, IsNormalUser
+from backend.renderers import streaming_json_list_response
+from backend.utils import flatten_errors
 from authentication.models import User
-from level.models import Level
+from level.models import Level, level_cache_generation
+from level.serializers import LevelSerializer
 from transaction.models import Transaction, WithdrawalAccount
 
+# Generation bumps only clear the per-process local-memory cache of the worker that made the
+# change (no shared CACHES backend), so keep the TTL short to bound staleness elsewhere
+LEVEL_PRODUCTS_CACHE_TIMEOUT = 15
+ZERO = Decimal('0.00')
+# Share of a training account's commission credited to its original account
+ORIGINAL_ACCOUNT_BONUS_PERCENT = Decimal('30')
+PRODUCTS_BREAKDOWN_LIMIT = 10
+RECENT_ACTIVITY_LIMIT = 5
+DEFAULT_PAGE_LIMIT = 20
+
+
+def today_start():
+    """Midnight at the start of the current day in the active time zone"""
+    return timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def parse_limit_offset(query_params, default_limit, max_limit=100):
+    """(limit, offset) from ?limit=&offset=, clamped to 1..max_limit and >= 0"""
+    try:
+        limit = max(1, min(int(query_params.get('limit', default_limit)), max_limit))
+    except (ValueError, TypeError):
+        limit = default_limit
+    try:
+        offset = max(0, int(query_params.get('offset', 0)))
+    except (ValueError, TypeError):
+        offset = 0
+    return limit, offset
+
+
+def slice_page(queryset, limit, offset):
+    """(rows, total) for one limit/offset page, sliced in SQL"""
+    page = list(queryset[offset:offset + limit])
+    # A short, non-empty (or first) page is the last one, so it already tells us the total
+    if len(page) < limit and (page or offset == 0):
+        return page, offset + len(page)
+    return page, queryset.count()
+
+
+def pagination_fields(total, limit, offset):
+    """Paging keys shared by the limit/offset list responses"""
+    has_more = (offset + limit) < total
+    return {
+        'count': total,
+        'limit': limit,
+        'offset': offset,
+        'has_more': has_more,
+        'next_offset': offset + limit if has_more else None
+    }
+
+
+def user_reviews_prefetch(user):
+    """Prefetch the user's review of each product into product.user_reviews, which ProductSerializer reads"""
+    return Prefetch('reviews', queryset=ProductReview.objects.filter(user=user), to_attr='user_reviews')
+
+
+def active_level_products(level):
+    """Active products assigned to level, as an EXISTS semi-join so no DISTINCT is needed over the M2M join"""
+    assigned = Product.levels.through.objects.filter(product_id=OuterRef('pk'), level_id=level.pk)
+    return Product.objects.filter(Exists(assigned), status='ACTIVE')
+
 
 class ProductListView(generics.ListCreateAPIView):
     """
@@ -65,6 +134,11 @@ class ProductListView(generics.ListCreateAPIView):
             queryset = queryset.order_by('price')
         else:
             queryset = queryset.order_by('price')
+
+        # The description TEXT column is the widest; don't load it when ?fields= leaves it out
+        requested = self.request.query_params.get('fields')
+        if requested and 'description' not in requested.split(','):
+            queryset = queryset.defer('description')
         return queryset
 
     def get_serializer_class(self):
@@ -75,8 +149,11 @@ class ProductListView(generics.ListCreateAPIView):
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context['request'] = self.request
+        if self.request.method != 'GET':
+            # Writes return the product without per-user review/commission fields
+            return context
         user_id = self.request.query_params.get('user_id')
-        if user_id and self.request.method == 'GET':
+        if user_id:
             try:
                 target = User.objects.get(id=int(user_id), role='USER')
                 if self.request.user.is_admin or target.created_by == self.request.user:
@@ -90,46 +167,30 @@ class ProductListView(generics.ListCreateAPIView):
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         if not serializer.is_valid():
-            errors = {}
-            for field, error_list in serializer.errors.items():
-                if isinstance(error_list, list):
-                    errors[field] = error_list[0] if error_list else 'Invalid value'
-                else:
-                    errors[field] = str(error_list)
-            
             return Response({
                 'message': 'Validation failed',
-                'errors': errors
+                'errors': flatten_errors(serializer.errors)
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        product = serializer.save()
+        serializer.save()
         return Response({
             'message': 'Product created successfully',
-            'product': ProductSerializer(product, context={'request': request}).data
+            'product': serializer.data
         }, status=status.HTTP_201_CREATED)
     
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-        total_count = queryset.count()
-        try:
-            limit = int(request.query_params.get('limit', 10))
-            limit = max(1, min(limit, 100))
-        except (ValueError, TypeError):
-            limit = 10
-        try:
-            offset = int(request.query_params.get('offset', 0))
-            offset = max(0, offset)
-        except (ValueError, TypeError):
-            offset = 0
-        page = queryset[offset:offset + limit]
-        serializer = self.get_serializer(page, many=True)
+        limit, offset = parse_limit_offset(request.query_params, 10)
+        context = self.get_serializer_context()
+        page, total_count = slice_page(queryset, limit, offset)
+        serializer = self.get_serializer_class()(page, many=True, context=context)
+        user = context.get('user')
+        # Only load the user's reviews if a field that reads them survived ?fields=
+        if user and user.is_authenticated and ProductSerializer.USER_REVIEW_FIELDS.intersection(serializer.child.fields):
+            prefetch_related_objects(page, user_reviews_prefetch(user))
         return Response({
             'products': serializer.data,
-            'count': total_count,
-            'limit': limit,
-            'offset': offset,
-            'has_more': (offset + limit) < total_count,
-            'next_offset': offset + limit if (offset + limit) < total_count else None
+            **pagination_fields(total_count, limit, offset)
         }, status=status.HTTP_200_OK)
 
 
@@ -159,22 +220,15 @@ class ProductDetailView(generics.RetrieveUpdateDestroyAPIView):
         serializer = self.get_serializer(instance, data=request.data, partial=partial)
         
         if not serializer.is_valid():
-            errors = {}
-            for field, error_list in serializer.errors.items():
-                if isinstance(error_list, list):
-                    errors[field] = error_list[0] if error_list else 'Invalid value'
-                else:
-                    errors[field] = str(error_list)
-            
             return Response({
                 'message': 'Validation failed',
-                'errors': errors
+                'errors': flatten_errors(serializer.errors)
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        product = serializer.save()
+        serializer.save()
         return Response({
             'message': 'Product updated successfully',
-            'product': ProductSerializer(product, context={'request': request}).data
+            'product': serializer.data
         }, status=status.HTTP_200_OK)
     
     def destroy(self, request, *args, **kwargs):
@@ -195,48 +249,31 @@ def assign_products_to_level(request):
     serializer = AssignProductsToLevelSerializer(data=request.data)
     
     if not serializer.is_valid():
-        errors = {}
-        for field, error_list in serializer.errors.items():
-            if isinstance(error_list, list):
-                errors[field] = error_list[0] if error_list else 'Invalid value'
-            else:
-                errors[field] = str(error_list)
-        
         return Response({
             'message': 'Validation failed',
-            'errors': errors
+            'errors': flatten_errors(serializer.errors)
         }, status=status.HTTP_400_BAD_REQUEST)
     
-    level_id = serializer.validated_data['level_id']
+    level = serializer.validated_data['level']
     product_ids = serializer.validated_data['product_ids']
     
-    try:
-        level = Level.objects.get(id=level_id)
-        
-        if product_ids:
-            products = Product.objects.filter(id__in=product_ids)
-            level.products.set(products)
-            message = f'{products.count()} product(s) assigned to level "{level.level_name}" successfully'
-        else:
-            level.products.clear()
-            message = f'All products removed from level "{level.level_name}" successfully'
-        
-        from level.serializers import LevelSerializer
-        level_data = LevelSerializer(level).data
-        
-        assigned_products = ProductSerializer(level.products.all(), many=True, context={'request': request}).data
-        
-        return Response({
-            'message': message,
-            'level': level_data,
-            'products': assigned_products,
-            'product_count': len(assigned_products)
-        }, status=status.HTTP_200_OK)
-        
-    except Level.DoesNotExist:
-        return Response({
-            'error': 'Level not found'
-        }, status=status.HTTP_404_NOT_FOUND)
+    if product_ids:
+        # The serializer already checked every id exists, so set() can take the pks directly
+        product_ids = set(product_ids)
+        level.products.set(product_ids)
+        message = f'{len(product_ids)} product(s) assigned to level "{level.level_name}" successfully'
+    else:
+        level.products.clear()
+        message = f'All products removed from level "{level.level_name}" successfully'
+    
+    assigned_products = ProductSerializer(level.products.all(), many=True, context={'request': request}).data
+    
+    return Response({
+        'message': message,
+        'level': LevelSerializer(level).data,
+        'products': assigned_products,
+        'product_count': len(assigned_products)
+    }, status=status.HTTP_200_OK)
 
 
 @api_view(['GET'])
@@ -246,6 +283,13 @@ def get_products_by_level(request, level_id):
     Get all products assigned to a particular level.
     GET: Retrieve all products for a specific level
     """
+    # Cache per URL briefly; a level or product change drops it at once in this worker
+    url_hash = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    cache_key = f'level-products:{level_cache_generation()}:{product_cache_generation()}:{url_hash}'
+    data = cache.get(cache_key)
+    if data is not None:
+        return Response(data, status=status.HTTP_200_OK)
+
     try:
         level = Level.objects.get(id=level_id)
         
@@ -277,16 +321,26 @@ def get_products_by_level(request, level_id):
         
         products = products.order_by('-created_at')
         
+        # Paging is opt-in so existing callers keep getting the full list
+        paging = None
+        if 'limit' in request.query_params:
+            limit, offset = parse_limit_offset(request.query_params, DEFAULT_PAGE_LIMIT)
+            products, total = slice_page(products, limit, offset)
+            paging = pagination_fields(total, limit, offset)
+        
         products_data = ProductSerializer(products, many=True, context={'request': request}).data
         
-        from level.serializers import LevelSerializer
         level_data = LevelSerializer(level).data
         
-        return Response({
+        data = {
             'level': level_data,
             'products': products_data,
             'count': len(products_data)
-        }, status=status.HTTP_200_OK)
+        }
+        if paging:
+            data.update(paging)
+        cache.set(cache_key, data, LEVEL_PRODUCTS_CACHE_TIMEOUT)
+        return Response(data, status=status.HTTP_200_OK)
         
     except Level.DoesNotExist:
         return Response({
@@ -320,14 +374,13 @@ def _get_dashboard_pool(user):
 
     level_products = list(
         Product.objects.filter(levels=level, status='ACTIVE', price__gte=min_price, price__lte=max_price)
-        .prefetch_related('reviews').order_by('price')[:min_orders]
+        .order_by('price')[:min_orders]
     )
     used_ids = {p.id for p in level_products}
     if len(level_products) < min_orders:
         extra_in_range = list(
             Product.objects.filter(status='ACTIVE', price__gte=min_price, price__lte=max_price)
             .exclude(id__in=used_ids)
-            .prefetch_related('reviews')
             .order_by('price')[:min_orders - len(level_products)]
         )
         pool_products = level_products + extra_in_range
@@ -407,18 +460,18 @@ def product_dashboard(request):
     """Dashboard: summary stats only (balance, commission, entitlements, completed, level, etc.). Use /dashboard-products/ for products.
     'completed' uses completed_products_count so re-inserting an item does not decrease the count; next item appears at inserted position."""
     user = request.user
-    today = timezone.now().date()
-    today_start = timezone.make_aware(datetime.combine(today, datetime.min.time()))
+    day_start = today_start()
 
     total_balance = float(user.balance)
     today_commission = ProductReview.objects.filter(
         user=user,
         status='COMPLETED',
-        completed_at__gte=today_start
+        completed_at__gte=day_start
     ).aggregate(total=Sum('commission_earned'))['total'] or 0.00
     today_commission = float(today_commission)
 
-    all_products_ordered, next_to_do, pool_products, entitlements_count, completed_in_pool, _ = _get_dashboard_pool(user)
+    # Entitlements are the level's min_orders; building the whole product pool isn't needed for that
+    entitlements_count = int(user.level.min_orders or 0) if user.level else 0
     completed_count = getattr(user, 'completed_products_count', 0) or 0
 
     commission_rate = 0.00
@@ -448,39 +501,38 @@ def product_dashboard(request):
 def product_dashboard_products(request):
     """Dashboard products: paginated list of next products to do. Products are filtered by price in [min_pct, max_pct]% of user balance; no agreed-price calculation."""
     user = request.user
-    try:
-        limit = max(1, min(int(request.query_params.get('limit', 50)), 50))
-    except (TypeError, ValueError):
-        limit = 50
-    try:
-        offset = max(0, int(request.query_params.get('offset', 0)))
-    except (TypeError, ValueError):
-        offset = 0
+    limit, offset = parse_limit_offset(request.query_params, 50, max_limit=50)
 
     all_products_ordered, next_to_do, pool_products, entitlements_count, completed_in_pool, product_positions = _get_dashboard_pool(user)
     slot_slice = next_to_do[offset:offset + limit] if next_to_do else []
     actual_offset = (product_positions.get(slot_slice[0].id, 1) - 1) if limit == 1 and slot_slice else offset
 
-    for slot_product in slot_slice:
-        if slot_product is None:
-            continue
-        ProductReview.objects.get_or_create(
-            user=user,
-            product=slot_product,
-            defaults={'status': 'PENDING'}
+    # Make sure every slot has a review for this user: read them in one query, insert only the missing
+    # ones in one batch, and hand them to the serializer as the user_reviews prefetch
+    slot_products = [p for p in slot_slice if p is not None]
+    reviews_by_product = {
+        r.product_id: r for r in ProductReview.objects.filter(user=user, product__in=slot_products)
+    }
+    missing = [p for p in slot_products if p.id not in reviews_by_product]
+    if missing:
+        ProductReview.objects.bulk_create(
+            [ProductReview(user=user, product=p, status='PENDING') for p in missing],
+            ignore_conflicts=True,
         )
+        reviews_by_product = {
+            r.product_id: r for r in ProductReview.objects.filter(user=user, product__in=slot_products)
+        }
+    for slot_product in slot_products:
+        review = reviews_by_product.get(slot_product.id)
+        slot_product.user_reviews = [review] if review else []
 
-    products_data = []
-    for slot_product in slot_slice:
-        if slot_product is None:
-            products_data.append(None)
-        else:
-            products_data.append(
-                ProductDashboardSerializer(
-                    slot_product,
-                    context={'request': request, 'user': user, 'product_positions': product_positions}
-                ).data
-            )
+    serializer = ProductDashboardSerializer(
+        context={'request': request, 'user': user, 'product_positions': product_positions}
+    )
+    products_data = [
+        serializer.to_representation(slot_product) if slot_product is not None else None
+        for slot_product in slot_slice
+    ]
 
     return Response({
         'products': products_data,
@@ -498,11 +550,12 @@ def get_products_by_review_status(request):
     Pending in this system = frozen (insufficient balance); other in-progress items are not returned.
     Query params: review_status = COMPLETED | PENDING_FROZEN | ALL
     """
-    from django.db.models import Q
     user = request.user
     review_status = request.query_params.get('review_status', None)
     
-    reviews = ProductReview.objects.filter(user=user).select_related('product', 'user')
+    # Going through the user's related manager attaches request.user to every review, so only
+    # the product needs joining; its description TEXT isn't serialized
+    reviews = user.product_reviews.select_related('product').defer('product__description')
     
     if review_status:
         review_status = review_status.upper()
@@ -522,13 +575,14 @@ def get_products_by_review_status(request):
         review_status = 'ALL'
     
     reviews = reviews.order_by('-completed_at', '-created_at')
-    reviews_data = ProductReviewSerializer(reviews, many=True, context={'request': request}).data
+    serializer = ProductReviewSerializer(context={'request': request})
     
-    return Response({
-        'reviews': reviews_data,
-        'count': len(reviews_data),
-        'review_status': review_status
-    }, status=status.HTTP_200_OK)
+    return streaming_json_list_response(
+        'reviews',
+        reviews.iterator(chunk_size=500),
+        serializer.to_representation,
+        extra={'review_status': review_status},
+    )
 
 
 @api_view(['POST'])
@@ -537,38 +591,28 @@ def submit_product_review(request):
     serializer = SubmitProductReviewSerializer(data=request.data, context={'user': request.user})
     
     if not serializer.is_valid():
-        error_messages = []
-        for field, error_list in serializer.errors.items():
-            if isinstance(error_list, list):
-                error_messages.append(error_list[0] if error_list else 'Invalid value')
-            else:
-                error_messages.append(str(error_list))
-        
+        error_messages = flatten_errors(serializer.errors).values()
         message = ' '.join(error_messages) if error_messages else 'Validation failed'
         return Response({
             'message': message
         }, status=status.HTTP_400_BAD_REQUEST)
     
-    product_id = serializer.validated_data['product_id']
+    product = serializer.validated_data['product']
     review_text = serializer.validated_data.get('review_text', '')
     user = request.user
     
     try:
-        product = Product.objects.get(id=product_id)
-        
-        from decimal import Decimal
-        from django.db import transaction as db_transaction
-        
         existing_review = ProductReview.objects.filter(user=user, product=product).first()
-        user_balance = Decimal(str(user.balance))
+        # DecimalFields already load as Decimal, so no str() round trips are needed
+        user_balance = user.balance
         if existing_review and getattr(existing_review, 'use_actual_price', False):
-            product_price = Decimal(str(product.price))
+            product_price = product.price
         elif product.use_actual_price:
-            product_price = Decimal(str(product.price))
+            product_price = product.price
         elif existing_review and existing_review.agreed_price is not None:
             product_price = existing_review.agreed_price
         else:
-            product_price = Decimal(str(product.price))
+            product_price = product.price
         
         was_previously_completed = existing_review and existing_review.status == 'COMPLETED'
         was_already_frozen_pending = (
@@ -592,15 +636,13 @@ def submit_product_review(request):
             use_frozen = existing_review and getattr(existing_review, 'use_frozen_commission', False)
             if use_frozen:
                 fr = getattr(user.level, 'frozen_commission_rate', None)
-                commission_rate = user.level.frozen_commission_rate if fr is not None else Decimal('6.00')
+                commission_rate = user.level.frozen_commission_rate if fr is not None else DEFAULT_FROZEN_COMMISSION_RATE
             else:
                 commission_rate = user.level.commission_rate
         else:
-            commission_rate = Decimal('0.00')
+            commission_rate = ZERO
 
-        commission_amount = (product_price * commission_rate) / Decimal('100')
-        original_account = None
-        original_account_bonus = Decimal('0.00')
+        commission_amount = (product_price * commission_rate) / HUNDRED
         
         with db_transaction.atomic():
             is_new_review = not existing_review
@@ -613,7 +655,7 @@ def submit_product_review(request):
                     existing_review.commission_earned = commission_amount
                     existing_review.completed_at = timezone.now()
                 else:
-                    existing_review.commission_earned = Decimal('0.00')
+                    existing_review.commission_earned = ZERO
                     existing_review.completed_at = None
                 update_fields = ['review_text', 'status', 'commission_earned', 'completed_at']
                 if review_status == 'PENDING':
@@ -627,18 +669,18 @@ def submit_product_review(request):
                     product=product,
                     review_text=review_text,
                     status=review_status,
-                    commission_earned=commission_amount if review_status == 'COMPLETED' else Decimal('0.00'),
+                    commission_earned=commission_amount if review_status == 'COMPLETED' else ZERO,
                     completed_at=timezone.now() if review_status == 'COMPLETED' else None,
                     use_frozen_commission=(review_status == 'PENDING'),
                 )
             
             if should_process_commission:
-                if user.is_training_account and user.original_account:
-                    original_account = user.original_account
-                    original_account_bonus = (commission_amount * Decimal('30')) / Decimal('100')
-                    original_account.balance += original_account_bonus
-                    original_account.save(update_fields=['balance'])
+                # Balances are adjusted with F() expressions so concurrent credits can't overwrite each other
+                if user.is_training_account and user.original_account_id:
+                    original_account_bonus = (commission_amount * ORIGINAL_ACCOUNT_BONUS_PERCENT) / HUNDRED
+                    User.objects.filter(pk=user.original_account_id).update(balance=F('balance') + original_account_bonus)
 
+                user_updates = {'completed_products_count': F('completed_products_count') + 1}
                 if is_frozen_pending and getattr(user, 'balance_frozen', False):
                     frozen_amount = Decimal(str(user.balance_frozen_amount or 0))
                     continuous_start = _get_start_continuous_orders_after(user) + 1
@@ -649,41 +691,45 @@ def submit_product_review(request):
                         position__gte=continuous_start,
                     ).exclude(product=product).exists()
                     if has_other_pending_inserted:
-                        user.balance_frozen_amount = frozen_amount + commission_amount
-                        user.save(update_fields=['balance_frozen_amount'])
+                        user_updates['balance_frozen_amount'] = frozen_amount + commission_amount
                     else:
-                        user.balance = user.balance + frozen_amount + commission_amount
-                        user.balance_frozen = False
-                        user.balance_frozen_amount = None
-                        user.save(update_fields=['balance', 'balance_frozen', 'balance_frozen_amount'])
+                        user_updates.update(
+                            balance=F('balance') + frozen_amount + commission_amount,
+                            balance_frozen=False,
+                            balance_frozen_amount=None,
+                        )
                 else:
-                    user.balance += commission_amount
-                    user.balance_frozen = False
-                    user.balance_frozen_amount = None
-                    user.save(update_fields=['balance', 'balance_frozen', 'balance_frozen_amount'])
-                User.objects.filter(pk=user.pk).update(completed_products_count=F('completed_products_count') + 1)
+                    user_updates.update(
+                        balance=F('balance') + commission_amount,
+                        balance_frozen=False,
+                        balance_frozen_amount=None,
+                    )
+                User.objects.filter(pk=user.pk).update(**user_updates)
             elif review_status == 'PENDING' and not getattr(user, 'balance_frozen', False):
-                user.balance = user_balance - product_price
-                user.balance_frozen = True
-                user.balance_frozen_amount = user_balance
-                user.save(update_fields=['balance', 'balance_frozen', 'balance_frozen_amount'])
+                # The frozen amount is the balance before this deduction; SET reads the old column value
+                User.objects.filter(pk=user.pk).update(
+                    balance=F('balance') - product_price,
+                    balance_frozen=True,
+                    balance_frozen_amount=F('balance'),
+                )
             elif review_status == 'PENDING' and getattr(user, 'balance_frozen', False):
                 if not was_already_frozen_pending:
-                    user.balance = user_balance - product_price
-                    user.save(update_fields=['balance'])
+                    User.objects.filter(pk=user.pk).update(balance=F('balance') - product_price)
         
-        today = timezone.now().date()
-        today_start = timezone.make_aware(datetime.combine(today, datetime.min.time()))
+        day_start = today_start()
         
-        today_commission = ProductReview.objects.filter(
-            user=user,
+        # Read today's commission and the fresh completed count in one query on the user row
+        today_commission_total = ProductReview.objects.filter(
+            user=OuterRef('pk'),
             status='COMPLETED',
-            completed_at__gte=today_start
-        ).aggregate(total=Sum('commission_earned'))['total'] or Decimal('0.00')
-        today_commission = float(today_commission)
-        
-        user.refresh_from_db()
-        completed_count = getattr(user, 'completed_products_count', 0) or 0
+            completed_at__gte=day_start
+        ).order_by().values('user').annotate(total=Sum('commission_earned')).values('total')
+        completed_count, today_commission = User.objects.filter(pk=user.pk).annotate(
+            today_commission=Subquery(today_commission_total)
+        ).values_list('completed_products_count', 'today_commission').get()
+        user.completed_products_count = completed_count
+        completed_count = completed_count or 0
+        today_commission = float(today_commission or ZERO)
         
         if review_status == 'COMPLETED':
             if existing_review and was_previously_completed:
@@ -711,19 +757,18 @@ def submit_product_review(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-def reset_user_level_progress_impl(user, level):
+def reset_user_level_progress_impl(user, level, extra_update_fields=()):
     """
     Reset all of the user's product progress. Removes every ProductReview for that user
     (any product, any status). Also deletes completed transactions and clears user
     progress fields. Balance unchanged. Caller must ensure permissions.
+    extra_update_fields are saved in the same UPDATE as the progress fields.
     """
-    reset_continuous_orders_for_user(user)
     all_user_reviews = ProductReview.objects.filter(user=user)
     completed_transactions = Transaction.objects.filter(
         member_account=user,
         status='COMPLETED'
     )
-    from django.db import transaction as db_transaction
     with db_transaction.atomic():
         all_user_reviews.delete()
         completed_transactions.delete()
@@ -731,7 +776,7 @@ def reset_user_level_progress_impl(user, level):
         user.balance_frozen = False
         user.balance_frozen_amount = None
         user.start_continuous_orders_after = None
-        user.save(update_fields=['completed_products_count', 'balance_frozen', 'balance_frozen_amount', 'start_continuous_orders_after'])
+        user.save(update_fields=['completed_products_count', 'balance_frozen', 'balance_frozen_amount', 'start_continuous_orders_after', *extra_update_fields])
 
 
 @api_view(['POST'])
@@ -766,12 +811,11 @@ def reset_user_level_progress(request, user_id, level_id):
         )
         completed_transaction_count = completed_transactions.count()
 
-        today = timezone.now().date()
-        today_start = timezone.make_aware(datetime.combine(today, datetime.min.time()))
+        day_start = today_start()
         today_completed_reviews = ProductReview.objects.filter(
             user=user,
             status='COMPLETED',
-            completed_at__gte=today_start
+            completed_at__gte=day_start
         )
         today_reviews_count = today_completed_reviews.count()
 
@@ -851,53 +895,67 @@ def user_product_completion_stats(request):
     if user_id:
         users_queryset = users_queryset.filter(id=user_id)
     
+    # The per-user totals come back as annotations on the user rows themselves; the GROUP BY needs an
+    # explicit order, newest first like the other user lists
+    day_start = today_start()
+    this_week_start = timezone.now() - timedelta(days=7)
+    completed = Q(product_reviews__status='COMPLETED')
+    users = users_queryset.annotate(
+        total_completed=Count('product_reviews', filter=completed),
+        total_commission=Sum('product_reviews__commission_earned', filter=completed),
+        today_completed=Count('product_reviews', filter=completed & Q(product_reviews__completed_at__gte=day_start)),
+        week_completed=Count('product_reviews', filter=completed & Q(product_reviews__completed_at__gte=this_week_start)),
+    ).order_by('-date_joined')
+
+    # Paging is opt-in so existing callers keep getting every user
+    paging = None
+    completed_reviews = ProductReview.objects.filter(user__in=users_queryset, status='COMPLETED')
+    if 'limit' in request.query_params:
+        limit, offset = parse_limit_offset(request.query_params, DEFAULT_PAGE_LIMIT)
+        users, total_users = slice_page(users, limit, offset)
+        paging = pagination_fields(total_users, limit, offset)
+        # The summary still covers every matching user, not just this page
+        summary = completed_reviews.aggregate(
+            total_completed_products=Count('id'),
+            total_commission_paid=Sum('commission_earned'),
+            users_with_completions=Count('user', distinct=True),
+        )
+        summary['total_commission_paid'] = float(summary['total_commission_paid'] or 0.00)
+        completed_reviews = completed_reviews.filter(user__in=[user.id for user in users])
+
+    # A user reviews each product at most once, so each completed review is its own breakdown row;
+    # only the latest PRODUCTS_BREAKDOWN_LIMIT per user are loaded, for every listed user at once
+    latest_reviews = completed_reviews.annotate(
+        row_number=Window(RowNumber(), partition_by=F('user_id'), order_by=F('completed_at').desc())
+    ).filter(row_number__lte=PRODUCTS_BREAKDOWN_LIMIT).values(
+        'user_id', 'product_id', 'product__title', 'product__price', 'commission_earned', 'completed_at'
+    ).order_by('user_id', 'row_number')
+    reviews_by_user = {}
+    for review in latest_reviews:
+        reviews_by_user.setdefault(review['user_id'], []).append(review)
+
     users_stats = []
     
-    for user in users_queryset:
-        completed_reviews = ProductReview.objects.filter(
-            user=user,
-            status='COMPLETED'
-        )
-        
-        total_completed = completed_reviews.count()
-        total_commission = completed_reviews.aggregate(
-            total=Sum('commission_earned')
-        )['total'] or 0.00
-        
-        today = timezone.now().date()
-        today_start = timezone.make_aware(datetime.combine(today, datetime.min.time()))
-        today_completed = completed_reviews.filter(completed_at__gte=today_start).count()
-        
-        this_week_start = timezone.now() - timedelta(days=7)
-        week_completed = completed_reviews.filter(completed_at__gte=this_week_start).count()
-        
-        products_breakdown = completed_reviews.values(
-            'product__id',
-            'product__title',
-            'product__price'
-        ).annotate(
-            completed_count=Count('id'),
-            commission_earned=Sum('commission_earned')
-        ).order_by('-completed_at')
+    for user in users:
+        user_reviews = reviews_by_user.get(user.id, [])
         
         products_data = []
-        for item in products_breakdown[:10]:
+        for review in user_reviews:
             products_data.append({
-                'product_id': item['product__id'],
-                'product_title': item['product__title'],
-                'product_price': float(item['product__price']),
-                'completed_count': item['completed_count'],
-                'commission_earned': float(item['commission_earned'])
+                'product_id': review['product_id'],
+                'product_title': review['product__title'],
+                'product_price': float(review['product__price']),
+                'completed_count': 1,
+                'commission_earned': float(review['commission_earned'])
             })
         
-        recent_reviews = completed_reviews.order_by('-completed_at')[:5]
         recent_activity = []
-        for review in recent_reviews:
+        for review in user_reviews[:RECENT_ACTIVITY_LIMIT]:
             recent_activity.append({
-                'product_id': review.product.id,
-                'product_title': review.product.title,
-                'commission_earned': float(review.commission_earned),
-                'completed_at': review.completed_at.isoformat() if review.completed_at else None
+                'product_id': review['product_id'],
+                'product_title': review['product__title'],
+                'commission_earned': float(review['commission_earned']),
+                'completed_at': review['completed_at'].isoformat() if review['completed_at'] else None
             })
         
         users_stats.append({
@@ -920,15 +978,23 @@ def user_product_completion_stats(request):
             'balance': float(user.balance),
             'is_active': user.is_active,
             'statistics': {
-                'total_completed_products': total_completed,
-                'total_commission_earned': float(total_commission),
-                'today_completed': today_completed,
-                'week_completed': week_completed,
+                'total_completed_products': user.total_completed,
+                'total_commission_earned': float(user.total_commission or 0.00),
+                'today_completed': user.today_completed,
+                'week_completed': user.week_completed,
                 'products_breakdown': products_data,
                 'recent_activity': recent_activity
             }
         })
     
+    if paging:
+        return Response({
+            'users': users_stats,
+            'total_users': paging['count'],
+            'summary': summary,
+            **paging
+        }, status=status.HTTP_200_OK)
+    
     return Response({
         'users': users_stats,
         'total_users': len(users_stats),
@@ -962,21 +1028,20 @@ def get_user_products_by_min_orders(request):
     
     min_orders = user.level.min_orders
     
-    all_level_products = Product.objects.filter(
-        levels=user.level,
-        status='ACTIVE'
-    ).prefetch_related('reviews').distinct().order_by('price')
+    all_level_products = active_level_products(user.level).order_by('price')
     
-    completed_reviews = ProductReview.objects.filter(
+    # Only the number of completed level products is needed here; exclusion happens in SQL below
+    completed_count = ProductReview.objects.filter(
         user=user,
         product__in=all_level_products,
         status='COMPLETED'
-    ).values_list('product_id', flat=True)
-    
-    completed_count = len(completed_reviews)
+    ).count()
     remaining_orders = max(0, min_orders - completed_count)
     
-    available_products = list(all_level_products.exclude(id__in=completed_reviews))[:remaining_orders]
+    completed_by_user = ProductReview.objects.filter(user=user, product=OuterRef('pk'), status='COMPLETED')
+    available_products = list(
+        all_level_products.filter(~Exists(completed_by_user)).prefetch_related(user_reviews_prefetch(user))[:remaining_orders]
+    )
     
     products_data = ProductSerializer(
         available_products,
@@ -986,7 +1051,7 @@ def get_user_products_by_min_orders(request):
     
     return Response({
         'min_orders': min_orders,
-        'total_products_available': len(all_level_products),
+        'total_products_available': all_level_products.count(),
         'remaining_products': remaining_orders,
         'completed_products': completed_count,
         'products': products_data,
@@ -1096,7 +1161,7 @@ def admin_user_order_overview(request, user_id):
                 ).update(
                     status='PENDING',
                     completed_at=None,
-                    commission_earned=Decimal('0.00'),
+                    commission_earned=ZERO,
                     agreed_price=None,
                 )
                 review, _ = ProductReview.objects.get_or_create(
@@ -1114,8 +1179,7 @@ def admin_user_order_overview(request, user_id):
             'start_continuous_orders_after': _get_start_continuous_orders_after(target_user)
         }, status=status.HTTP_200_OK)
 
-    today = timezone.now().date()
-    today_start = timezone.make_aware(datetime.combine(today, datetime.min.time()))
+    day_start = today_start()
 
     if not target_user.level:
         return Response({
@@ -1136,7 +1200,7 @@ def admin_user_order_overview(request, user_id):
     orders_received_today = ProductReview.objects.filter(
         user=target_user,
         status='COMPLETED',
-        completed_at__gte=today_start
+        completed_at__gte=day_start
     ).count()
 
     start_continuous_orders_after = _get_start_continuous_orders_after(target_user)
@@ -1200,10 +1264,7 @@ def get_user_completed_products_count(request, user_id):
     
     min_orders = target_user.level.min_orders
     
-    all_level_products = Product.objects.filter(
-        levels=target_user.level,
-        status='ACTIVE'
-    ).distinct()
+    all_level_products = active_level_products(target_user.level)
     
     completed_count = ProductReview.objects.filter(
         user=target_user,
@@ -1232,7 +1293,7 @@ def admin_user_account_details(request, user_id):
     total_commission = ProductReview.objects.filter(
         user=target_user,
         status='COMPLETED'
-    ).aggregate(total=Sum('commission_earned'))['total'] or Decimal('0.00')
+    ).aggregate(total=Sum('commission_earned'))['total'] or ZERO
     total_commission = float(total_commission)
 
     primary_wallet = (
@@ -1435,7 +1496,6 @@ def insert_product_at_position(request, product_id):
             return Response({
                 'error': 'You can only insert for users created by you'
             },             status=status.HTTP_403_FORBIDDEN)
-    from django.db import transaction as db_transaction
 
     with db_transaction.atomic():
         current_position = product.position
@@ -1471,7 +1531,7 @@ def insert_product_at_position(request, product_id):
             ).update(
                 status='PENDING',
                 completed_at=None,
-                commission_earned=Decimal('0.00'),
+                commission_earned=ZERO,
                 agreed_price=None,
                 use_frozen_commission=False,
             )
@@ -1637,7 +1697,7 @@ def admin_add_product_to_continuous_order(request, user_id, product_id):
     if review.status == 'COMPLETED':
         review.status = 'PENDING'
         review.completed_at = None
-        review.commission_earned = Decimal('0.00')
+        review.commission_earned = ZERO
         review.agreed_price = None
         update_fields.extend(['status', 'completed_at', 'commission_earned', 'agreed_price'])
     review.use_actual_price = True
@@ -1691,7 +1751,7 @@ def admin_replace_next_order(request, user_id, product_id):
     if review.status == 'COMPLETED':
         review.status = 'PENDING'
         review.completed_at = None
-        review.commission_earned = Decimal('0.00')
+        review.commission_earned = ZERO
         review.agreed_price = None
         update_fields.extend(['status', 'completed_at', 'commission_earned', 'agreed_price'])
     review.use_actual_price = True
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-16 12:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transaction', '0005_alter_withdrawalaccount_crypto_network_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['member_account', 'status', 'type', 'created_at'], name='transaction_member__366e97_idx'),
+        ),
+    ]
@@ -95,6 +95,7 @@ class Transaction(models.Model):
             models.Index(fields=['transaction_id']),
             models.Index(fields=['member_account', '-created_at']),
             models.Index(fields=['status', '-created_at']),
+            models.Index(fields=['member_account', 'status', 'type', 'created_at']),
         ]
     
     def __str__(self):